@@ -0,0 +1,438 @@
+# --- Benchmarks für einkauf2 und notiz ---
+# Dieser Block erzeugt synthetische Bestände (Standard: 1k, 10k, 100k Rezepte
+# bzw. Notizen), misst Startzeit, Latenzen typischer Aktionen, Lade-/Speicher-
+# durchsatz und Spitzen-RSS und schreibt alles als JSON, damit Commits
+# vergleichbar sind:
+#     python benchmark.py run [--sizes 1000 10000] [--only einkauf] [--out datei.json]
+#     python benchmark.py compare alt.json neu.json [--threshold 0.1]
+# Jede Messung läuft in einem eigenen Prozess (saubere Spitzen-RSS). einkauf2
+# läuft mit QT_QPA_PLATFORM=offscreen; notiz braucht ein X-Display: ohne
+# DISPLAY wird Xvfb gestartet, fehlt es, wird notiz übersprungen und der Grund
+# im Ergebnis vermerkt.
+# Name: benchmark
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_REPEAT = 20
+OP_BUDGET = 30.0        # Sekunden pro Aktion; danach keine weiteren Wiederholungen
+CHILD_TIMEOUT = 900     # Sekunden pro Kindprozess
+SEED = 4711
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# --- Hilfsfunktionen: Zeitmessung und Statistik ---
+# Zweck: Latenzen in Millisekunden sammeln und zusammenfassen
+# Name: summarize
+def summarize(samples: list) -> dict:
+    if not samples:
+        return {"n": 0}
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "n": len(ordered),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(p95, 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def measure(action, repeat: int, budget: float = OP_BUDGET) -> dict:
+    """
+    Führt action(i) bis zu repeat-mal aus, mindestens einmal, höchstens bis das
+    Zeitbudget aufgebraucht ist.
+    Output: Zusammenfassung der Latenzen
+    """
+    samples = []
+    spent = 0.0
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        action(i)
+        dt = time.perf_counter() - t0
+        samples.append(dt * 1000.0)
+        spent += dt
+        if spent > budget:
+            break
+    return summarize(samples)
+
+
+def peak_rss_kb() -> int:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux meldet kB, macOS Bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+# --- Testdaten ---
+# Zweck: deterministische Bestände, damit Läufe auf verschiedenen Commits
+#        dieselben Daten sehen
+# Name: make_recipes
+def make_recipes(n: int, rng: random.Random):
+    n_ingredients = max(50, n // 10)
+    ingredients = [f"Zutat {i}" for i in range(n_ingredients)]
+    recipes = [(f"Rezept {i:06d}", rng.sample(ingredients, rng.randint(3, 10))) for i in range(n)]
+    availability = [(name, rng.random() < 0.5) for name in ingredients]
+    return recipes, availability
+
+
+def make_notes(n: int, rng: random.Random):
+    words = ("Kapitel", "Einleitung", "Grundlagen", "Beispiel", "Übung", "Anhang",
+             "Zusammenfassung", "Methode", "Ergebnis", "Diskussion", "Quelle", "Register")
+    notes = []
+    for i in range(n):
+        body = "\n".join(f"{k + 1}. " + " ".join(rng.choices(words, k=4)) for k in range(rng.randint(5, 30)))
+        notes.append({"titel": f"Buch {i:06d}", "inhalt": body, "status": "Neu" if i % 2 == 0 else "Alt"})
+    return notes
+
+
+# --- Messung einkauf2 (Kindprozess) ---
+# Zweck: MainWindow offscreen starten und Einzelaktionen wie ein Benutzer auslösen
+# Name: bench_einkauf
+def bench_einkauf(size: int, repeat: int, workdir: str) -> dict:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6 import QtCore, QtWidgets
+    import einkauf_gui
+    from einkauf_store import RecipeStore
+
+    rng = random.Random(SEED)
+    recipes, availability = make_recipes(size, rng)
+    db = os.path.join(workdir, "bench.db")
+
+    result = {}
+    store = RecipeStore(db)
+    t0 = time.perf_counter()
+    store.add_ingredients(availability)
+    store.save_recipes(recipes)
+    dt = time.perf_counter() - t0
+    result["store_save"] = {"seconds": round(dt, 4), "recipes_per_s": round(size / dt, 1)}
+    t0 = time.perf_counter()
+    store.load()
+    dt = time.perf_counter() - t0
+    result["store_load"] = {"seconds": round(dt, 4), "recipes_per_s": round(size / dt, 1)}
+    store.close()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    def settle():
+        # Ereignisschleife abarbeiten, bis gesammelte Änderungen geschrieben sind
+        app.processEvents()
+        while window._flush_timer.isActive():
+            window._flush_pending()
+            app.processEvents()
+
+    t0 = time.perf_counter()
+    window = einkauf_gui.MainWindow(RecipeStore(db))
+    window.resize(1000, 640)
+    window.show()
+    app.processEvents()
+    result["startup_s"] = round(time.perf_counter() - t0, 4)
+
+    known = [name for name, _ in availability]
+
+    def add(i):
+        window.recipe_name_edit.setText(f"Neu {i:06d}")
+        window.recipe_ingredients_edit.setPlainText(", ".join(rng.sample(known, 5)))
+        window.add_recipe()
+        settle()
+
+    def toggle(i):
+        model = window.ingredient_model
+        idx = model.index(i % model.rowCount(), 0)
+        state = model.data(idx, QtCore.Qt.CheckStateRole)
+        checked = QtCore.Qt.CheckState(state) == QtCore.Qt.Checked
+        model.setData(idx, QtCore.Qt.Unchecked if checked else QtCore.Qt.Checked, QtCore.Qt.CheckStateRole)
+        settle()
+
+    def select(i):
+        model = window.recipe_model
+        window.recipe_list.setCurrentIndex(model.index(rng.randrange(model.rowCount()), 0))
+        settle()
+
+    def delete(i):
+        select(i)
+        window.delete_selected_recipe()
+        settle()
+
+    result["add"] = measure(add, repeat)
+    result["toggle"] = measure(toggle, repeat)
+    result["select"] = measure(select, repeat)
+    result["delete"] = measure(delete, repeat)
+
+    t0 = time.perf_counter()
+    window.close()
+    app.processEvents()
+    result["shutdown_s"] = round(time.perf_counter() - t0, 4)
+    return result
+
+
+# --- Messung notiz (Kindprozess) ---
+# Zweck: InhaltsApp unter X starten und Ansichten/Aktionen über die Knöpfe auslösen
+# Name: bench_notiz
+def bench_notiz(size: int, repeat: int, workdir: str) -> dict:
+    import csv
+    import tkinter as tk
+    from tkinter import ttk
+    import notiz
+
+    rng = random.Random(SEED)
+    notes = make_notes(size, rng)
+    os.chdir(workdir)  # notiz liest und schreibt relativ zum Arbeitsverzeichnis
+    with open(notiz.FILE, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["titel", "inhalt", "status"])
+        writer.writeheader()
+        writer.writerows(notes)
+
+    result = {}
+    root = tk.Tk()
+    root.geometry("600x500")
+    t0 = time.perf_counter()
+    app = notiz.InhaltsApp(root)
+    root.update()
+    result["startup_s"] = round(time.perf_counter() - t0, 4)
+
+    def widgets(parent, cls):
+        found = []
+        for child in parent.winfo_children():
+            if isinstance(child, cls):
+                found.append(child)
+            found.extend(widgets(child, cls))
+        return found
+
+    def button(text):
+        for b in widgets(app.main, ttk.Button):
+            if b.cget("text") == text:
+                return b
+        raise LookupError(text)
+
+    def pick(status):
+        items = app.store.bucket(status)
+        return rng.choice(items)
+
+    def switch(i):
+        app.list_view("Alt" if i % 2 == 0 else "Neu")
+        root.update()
+
+    def add(i):
+        app.add_view()
+        widgets(app.main, ttk.Entry)[0].insert(0, f"Neu {i:06d}")
+        widgets(app.main, tk.Text)[0].insert("1.0", "1. Einleitung\n2. Hauptteil")
+        button("Speichern").invoke()
+        root.update()
+
+    def select(i):
+        app.edit_view(pick("Neu"))
+        root.update()
+
+    def toggle(i):
+        app.edit_view(pick("Neu"))
+        button("Verschieben").invoke()
+        root.update()
+
+    def delete(i):
+        app.list_view("Neu")
+        app.delete(pick("Neu"))
+        root.update()
+
+    queries = ("kapitel", "buch 00", "einl", "übung anh", "methode ergebnis quelle")
+
+    def search(i):
+        # Tippen ins Suchfeld: Liste wird bei jeder Änderung neu gefiltert
+        app.query.set(queries[i % len(queries)])
+        root.update()
+
+    t0 = time.perf_counter()
+    for _ in range(3):
+        app.load_data()
+    dt = (time.perf_counter() - t0) / 3
+    result["load_data"] = {"seconds": round(dt, 4), "notes_per_s": round(size / dt, 1)}
+    t0 = time.perf_counter()
+    for _ in range(3):
+        app.save_data()
+    dt = (time.perf_counter() - t0) / 3
+    result["save_data"] = {"seconds": round(dt, 4), "notes_per_s": round(size / dt, 1)}
+    app.list_view("Neu")
+    root.update()
+
+    result["list_view_switch"] = measure(switch, repeat)
+    result["add"] = measure(add, repeat)
+    result["select"] = measure(select, repeat)
+    result["toggle"] = measure(toggle, repeat)
+    result["delete"] = measure(delete, repeat)
+    result["search"] = measure(search, repeat)
+    app.query.set("")
+    root.destroy()
+    return result
+
+
+BENCHES = {"einkauf": bench_einkauf, "notiz": bench_notiz}
+
+
+def child_main(target: str, size: int, repeat: int) -> int:
+    # Läuft im Kindprozess: Ergebnis als eine JSON-Zeile auf stdout
+    sys.path.insert(0, HERE)
+    workdir = tempfile.mkdtemp(prefix=f"bench-{target}-")
+    try:
+        result = BENCHES[target](size, repeat, workdir)
+        result["peak_rss_kb"] = peak_rss_kb()
+    finally:
+        os.chdir(HERE)
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps(result))
+    return 0
+
+
+# --- Virtuelles Display für Tk ---
+# Zweck: notiz braucht einen X-Server; ohne DISPLAY wird Xvfb gestartet
+# Name: start_xvfb
+def start_xvfb():
+    """
+    Output: (env, process) — process ist None, wenn ein Display schon da war;
+            env ist None, wenn kein Display verfügbar ist
+    """
+    if os.environ.get("DISPLAY"):
+        return dict(os.environ), None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return None, None
+    display = ":%d" % (90 + os.getpid() % 100)
+    proc = subprocess.Popen([xvfb, display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(1.0)
+    if proc.poll() is not None:
+        return None, None
+    return dict(os.environ, DISPLAY=display), proc
+
+
+def run_child(target: str, size: int, repeat: int, env: dict) -> dict:
+    cmd = [sys.executable, os.path.abspath(__file__), "_child", target, str(size), str(repeat)]
+    try:
+        proc = subprocess.run(cmd, env=env, capture_output=True, text=True, timeout=CHILD_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return {"error": f"Zeitüberschreitung nach {CHILD_TIMEOUT} s"}
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["Exitcode %d" % proc.returncode])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "-C", HERE, "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "-C", HERE, "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True).stdout.strip()
+        return out + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unbekannt"
+
+
+# --- Befehl: run ---
+# Zweck: alle Messungen ausführen und als JSON-Datei ablegen
+# Name: cmd_run
+def cmd_run(args) -> int:
+    revision = git_revision()
+    report = {
+        "revision": revision,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": {},
+    }
+    targets = [args.only] if args.only else list(BENCHES)
+    xvfb = None
+    try:
+        for target in targets:
+            if target == "notiz":
+                env, xvfb = start_xvfb()
+                if env is None:
+                    report["results"]["notiz"] = {"skipped": "kein X-Display und kein Xvfb gefunden"}
+                    print("notiz: übersprungen (kein X-Display und kein Xvfb)")
+                    continue
+            else:
+                env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+            report["results"][target] = {}
+            for size in args.sizes:
+                print(f"{target} {size} …", flush=True)
+                result = run_child(target, size, args.repeat, env)
+                report["results"][target][str(size)] = result
+                if "error" in result:
+                    print(f"  Fehler: {result['error']}")
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    out = args.out or f"benchmark-{revision}.json"
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Ergebnisse: {out}")
+    return 0
+
+
+# --- Befehl: compare ---
+# Zweck: zwei Ergebnisdateien gegenüberstellen, Verschlechterungen markieren
+# Name: cmd_compare
+def flatten(results: dict, prefix: str = ""):
+    # Vergleichbare Kennzahlen: Medianlatenzen und Zeiten in Sekunden (kleiner = besser)
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from flatten(value, path + ".")
+        elif isinstance(value, (int, float)) and key in ("median_ms", "p95_ms", "seconds",
+                                                         "startup_s", "shutdown_s", "peak_rss_kb"):
+            yield path, value
+
+
+def cmd_compare(args) -> int:
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    before = dict(flatten(old["results"]))
+    after = dict(flatten(new["results"]))
+    regressions = 0
+    print(f"{'Kennzahl':<45} {old['revision']:>12} {new['revision']:>12} {'Änderung':>9}")
+    for key in sorted(before.keys() & after.keys()):
+        a, b = before[key], after[key]
+        change = (b - a) / a if a else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  <-- langsamer"
+            regressions += 1
+        print(f"{key:<45} {a:>12g} {b:>12g} {change:>+8.1%}{flag}")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["_child"]:
+        return child_main(argv[1], int(argv[2]), int(argv[3]))
+    parser = argparse.ArgumentParser(description="Benchmarks für einkauf2 und notiz")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("run", help="Messungen ausführen")
+    p.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    p.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    p.add_argument("--only", choices=sorted(BENCHES))
+    p.add_argument("--out", help="Ergebnisdatei (Standard: benchmark-<revision>.json)")
+    p.set_defaults(func=cmd_run)
+    p = sub.add_parser("compare", help="zwei Ergebnisdateien vergleichen")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=0.1, help="relative Verschlechterung, ab der markiert wird")
+    p.set_defaults(func=cmd_compare)
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+# --- Massenimport von Rezeptdateien für einkauf2 (ohne Qt) ---
+# Dieser Block liest ganze Verzeichnisse mit Rezeptdateien ein. Zerlegen und
+# Normalisieren der Zutaten laufen in einem Prozess-Pool (alle Kerne); der
+# Aufrufer bekommt die Rezepte in großen Blöcken, in Dateireihenfolge, und
+# übernimmt jeden Block auf einmal (eine Transaktion, ein Listen-Update).
+# Dateiformate (UTF-8, sonst Windows-1252):
+#     .txt   eine Zeile pro Rezept "Name: Zutat, Zutat, ..." (# = Kommentar)
+#            oder, wenn die erste Zeile keinen ":" hat, ein Rezept pro Datei:
+#            erste Zeile Name, danach Zutaten (pro Zeile eine oder mit Komma)
+#     .csv   Name in der ersten Spalte, Zutaten in den übrigen; Trenner ist ; oder
+#            Tab, wenn die erste Zeile einen davon enthält, sonst , (Zellen dürfen
+#            dann Komma-Listen sein)
+#     .json  Exportformat von einkauf2 oder {"Name": ["Zutat", ...] | "Zutat, ..."}
+# Name: einkauf_bulk
+import codecs
+import csv
+import itertools
+import multiprocessing
+import os
+from collections import deque
+
+import einkauf_json
+from einkauf_names import normalize_name, parse_ingredients
+
+SUFFIXES = (".txt", ".csv", ".json")
+# Rezepte pro Block an den Aufrufer
+BATCH_SIZE = 5000
+# Ungefähre Bytes pro Auftrag an einen Prozess: kleine Dateien werden gebündelt,
+# große .txt-Dateien im Zeilenformat an Zeilengrenzen geteilt
+JOB_BYTES = 1 << 20
+JOB_FILES = 256
+# Erste Zellen, an denen eine CSV-Kopfzeile erkannt wird
+CSV_HEADERS = ("name", "rezept", "rezeptname", "recipe")
+
+
+# --- Hilfsfunktion: Zeile dekodieren ---
+# Zweck: UTF-8 (mit BOM), ältere Windows-Dateien als Windows-1252
+# Name: _decode
+def _decode(line: bytes) -> str:
+    try:
+        return line.decode("utf-8")
+    except UnicodeDecodeError:
+        return line.decode("cp1252", errors="replace")
+
+
+def _lines(f, start: int = 0, end: int = None):
+    # Zeilen, die in [start, end) beginnen; die Zeile über start gehört dem Vorgänger
+    if start:
+        f.seek(start - 1)
+        f.readline()
+    first = not start
+    while end is None or f.tell() < end:
+        line = f.readline()
+        if not line:
+            return
+        if first:
+            line = line.removeprefix(codecs.BOM_UTF8)
+            first = False
+        yield _decode(line).rstrip("\r\n")
+
+
+# --- Hilfsfunktion: Rezept normalisieren ---
+# Zweck: Leerraum wie im Zutatenregister, Schlüssel schon hier berechnen (im Prozess-Pool)
+# Name: _recipe
+def _recipe(name, ingredients, out: list):
+    name = " ".join(str(name).split())
+    if not name:
+        return
+    names = [" ".join(str(z).split()) for z in ingredients]
+    names = [z for z in names if z]
+    out.append((name, names, [normalize_name(z) for z in names]))
+
+
+def _content(lines):
+    # Ohne Leerzeilen und #-Kommentare
+    return (line for line in lines if line.strip() and not line.lstrip().startswith("#"))
+
+
+# --- Leser je Format ---
+# Zweck: hängen (name, zutaten, schlüssel) an out an; ValueError bei kaputten Dateien
+# Name: _read_txt
+def _read_txt(f, start: int, end: int, single, out: list):
+    # single: ein Rezept pro Datei; None = an der ersten Inhaltszeile erkennen
+    lines = _content(_lines(f, start, end))
+    first = next(lines, None)
+    if first is None:
+        return
+    if single is None:
+        single = ":" not in first
+    if single:
+        _recipe(first, [z for line in lines for z in parse_ingredients(line)], out)
+        return
+    for line in itertools.chain((first,), lines):
+        name, sep, rest = line.partition(":")
+        if not sep:
+            raise ValueError(f"Zeile ohne ':': {line[:60]}")
+        _recipe(name, parse_ingredients(rest), out)
+
+
+def _csv_delimiter(line: str) -> str:
+    # Nicht raten (csv.Sniffer nimmt bei Komma-Listen in den Zellen ","): ; oder
+    # Tab in der ersten Zeile entscheiden, nur ohne beide gilt ","
+    found = [d for d in (";", "\t") if d in line]
+    if len(found) > 1:
+        raise ValueError("CSV: Trenner unklar, erste Zeile enthält ; und Tab")
+    return found[0] if found else ","
+
+
+def _read_csv(f, out: list):
+    first = next((line for line in _lines(f) if line.strip()), None)
+    if first is None:
+        return
+    delimiter = _csv_delimiter(first)
+    f.seek(0)
+    for k, row in enumerate(csv.reader(_lines(f), delimiter=delimiter)):
+        if not row or (k == 0 and row[0].strip().casefold() in CSV_HEADERS):
+            continue
+        _recipe(row[0], [z for cell in row[1:] for z in parse_ingredients(cell)], out)
+
+
+def _ingredient_list(name, value) -> list:
+    if isinstance(value, str):
+        return parse_ingredients(value)
+    if isinstance(value, list):
+        return [str(z) for z in value]
+    raise ValueError(f"Zutaten von {name!r} sind weder Liste noch Text")
+
+
+def _read_json(f, out: list):
+    reader = einkauf_json.JsonStreamReader(f)
+    for key in reader.iter_object():
+        if key in ("recipes", "ingredients") and reader.peek() == "{":
+            # Exportformat: Rezepte einzeln lesen, Verfügbarkeiten gehören nicht dazu
+            for name in reader.iter_object():
+                value = reader.read_value()
+                if key == "recipes":
+                    _recipe(name, _ingredient_list(name, value), out)
+        else:
+            _recipe(key, _ingredient_list(key, reader.read_value()), out)
+
+
+# --- Auftrag im Prozess-Pool ---
+# Zweck: liest eine Liste von Dateistücken; Fehler betreffen nur die eine Datei
+# Name: parse_job
+def parse_job(parts: list):
+    """
+    Input: [(pfad, start, ende, ein_rezept_pro_datei oder None), ...]
+    Output: (rezepte [(name, zutaten)], schlüssel [[...], ...], gelesene Bytes,
+             Fehler [(pfad, meldung)])
+    """
+    parsed, errors, size = [], [], 0
+    for path, start, end, single in parts:
+        size += end - start
+        found = []
+        try:
+            with open(path, "rb") as f:
+                suffix = os.path.splitext(path)[1].lower()
+                if suffix == ".txt":
+                    _read_txt(f, start, end, single, found)
+                elif suffix == ".csv":
+                    _read_csv(f, found)
+                else:
+                    _read_json(f, found)
+        except (OSError, ValueError, csv.Error) as e:
+            errors.append((path, str(e)))
+            continue
+        parsed.extend(found)
+    return [(name, names) for name, names, _ in parsed], [keys for _, _, keys in parsed], size, errors
+
+
+# --- Dateien suchen, Aufträge planen ---
+# Zweck: Dateien in Verzeichnisreihenfolge zu Aufträgen von etwa JOB_BYTES bündeln
+# Name: list_files
+def list_files(directory: str) -> list:
+    # [(pfad, größe)] aller Rezeptdateien, rekursiv und sortiert (stabile Reihenfolge)
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(SUFFIXES):
+                path = os.path.join(root, name)
+                try:
+                    found.append((path, os.path.getsize(path)))
+                except OSError:
+                    continue  # zwischen Auflisten und Lesen verschwunden
+    return found
+
+
+def _single_recipe_file(path: str) -> bool:
+    # .txt ohne ":" in der ersten Inhaltszeile: die ganze Datei ist ein Rezept
+    with open(path, "rb") as f:
+        first = next(_content(_lines(f)), "")
+    return ":" not in first
+
+
+def plan_jobs(files: list, job_bytes: int = JOB_BYTES):
+    job, size = [], 0
+    for path, length in files:
+        # Nur große .txt im Zeilenformat werden geteilt (CSV-Zellen dürfen
+        # Zeilenumbrüche enthalten); kleine Dateien erkennt der Prozess selbst
+        single = None
+        if path.lower().endswith(".txt") and length > job_bytes:
+            try:
+                single = _single_recipe_file(path)
+            except OSError:
+                pass  # der Fehler wird beim Lesen gemeldet
+        step = job_bytes if single is False else max(length, 1)
+        for start in range(0, max(length, 1), step):
+            end = min(start + step, length)
+            job.append((path, start, end, single))
+            size += end - start
+            if size >= job_bytes or len(job) >= JOB_FILES:
+                yield job
+                job, size = [], 0
+    if job:
+        yield job
+
+
+# --- Import: Blöcke erzeugen ---
+# Zweck: verteilt die Aufträge auf Prozesse und liefert die Ergebnisse blockweise
+# Name: iter_batches
+def iter_batches(directory: str, batch_size: int = BATCH_SIZE, cancelled=None, errors=None,
+                 workers: int = None):
+    """
+    Input: directory; cancelled() -> bool optional; errors: Liste, an die
+           (pfad, meldung) für nicht lesbare Dateien angehängt wird
+    Output: Generator von (rezepte [(name, zutaten)], schlüssel, gelesene Bytes, Bytes gesamt)
+    Höchstens zwei Aufträge pro Prozess sind unterwegs; die Ergebnisse kommen
+    in Dateireihenfolge (bei doppelten Rezeptnamen gewinnt wie sonst das letzte).
+    """
+    from concurrent.futures import ProcessPoolExecutor, TimeoutError
+    files = list_files(directory)
+    total = sum(size for _, size in files)
+    jobs = plan_jobs(files)
+    workers = workers or os.cpu_count() or 1
+    # spawn statt fork: der Aufrufer hat Threads (Qt), fork wäre dann unsicher.
+    # Die Arbeitsprozesse laden nur dieses Modul und das gestartete Skript neu;
+    # einkauf2.py importiert Qt deshalb erst in seinem __main__-Block
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        running = deque()
+        items, keys, done = [], [], 0
+        while True:
+            while len(running) < 2 * workers:
+                job = next(jobs, None)
+                if job is None:
+                    break
+                running.append(pool.submit(parse_job, job))
+            if not running:
+                break
+            while True:
+                if cancelled is not None and cancelled():
+                    raise einkauf_json.Cancelled()
+                try:
+                    recipes, recipe_keys, size, failed = running[0].result(timeout=0.1)
+                    break
+                except TimeoutError:
+                    continue
+            running.popleft()
+            items.extend(recipes)
+            keys.extend(recipe_keys)
+            done += size
+            if errors is not None:
+                errors.extend(failed)
+            while len(items) >= batch_size:
+                yield items[:batch_size], keys[:batch_size], done, total
+                del items[:batch_size], keys[:batch_size]
+        if items:
+            yield items, keys, done, total
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,438 @@
+# --- Kern von einkauf2 (ohne Qt) ---
+# Dieser Block enthält Datenmodell, Abfragen, Speicherung und Import/Export.
+# Das Hauptfenster in einkauf_gui.py ist nur eine Ansicht darüber; Skripte und
+# Cron-Jobs nutzen den Kern direkt über die Kommandozeile (siehe main).
+# Name: einkauf_core
+import argparse
+import sys
+from array import array
+from collections.abc import Mapping
+
+import einkauf_bulk
+import einkauf_json
+from einkauf_names import IngredientRegistry, TrigramIndex
+from einkauf_store import RecipeStore, DB_FILE
+
+# --- Sicht: gelistete Zutaten wie ein dict {"Zutat": bool} ---
+# Zweck: Zugriff per Name (normalisiert, also "eier" == "Eier "), Daten liegen im Index
+# Name: IngredientView
+class IngredientView(Mapping):
+    def __init__(self, index):
+        self._index = index
+
+    def __getitem__(self, name: str) -> bool:
+        ident = self._index.registry.lookup(name)
+        if ident is None or ident not in self._index.listed:
+            raise KeyError(name)
+        return bool(self._index.avail[ident])
+
+    def __iter__(self):
+        names = self._index.registry.names
+        return (names[i] for i in list(self._index.listed))
+
+    def __len__(self):
+        return len(self._index.listed)
+
+# --- Datenmodell: Rezepte, Zutaten und Rückwärtsindex (ohne Qt) ---
+# Zweck: hält pro Zutat die Rezepte, die sie verwenden, und pro Rezept einen
+#        Zähler "verfügbar/gesamt"; ein Zutat-Toggle fasst nur betroffene Rezepte an
+# Name: RecipeIndex
+class RecipeIndex:
+    """
+    Rezept-/Zutatenmodell mit inkrementell gepflegter Verfügbarkeit.
+    Zutaten laufen über das Register (kanonischer Name -> ID); Rezepte speichern
+    nur kompakte ID-Arrays.
+    Toggle einer Zutat: O(Rezepte mit dieser Zutat)
+    Fortschritt eines Rezepts: O(1)
+    """
+    def __init__(self):
+        self.registry = IngredientRegistry()
+        self.search = TrigramIndex()   # über alle gelisteten oder verwendeten Zutaten
+        self.recipes = {}      # {"Rezeptname": array("I", [id, ...])}
+        self.ingredients = IngredientView(self)  # gelistete Zutaten: {"Zutat": bool}
+        self.listed = {}       # {id: None} in der Zutatenverwaltung, in Anlegereihenfolge
+        self.avail = bytearray()  # id -> 1 wenn verfügbar
+        self.users = {}        # {id: {"Rezeptname": Anzahl Vorkommen}}
+        self.available = {}    # {"Rezeptname": Anzahl verfügbarer Zutaten}
+
+    # ---------- Namen und IDs ----------
+    def _intern(self, name: str, key: str = None) -> int:
+        ident = self.registry.intern(name, key)
+        if ident >= len(self.avail):
+            self.avail.extend(bytes(ident + 1 - len(self.avail)))
+        return ident
+
+    def ingredient_id(self, name: str):
+        return self.registry.lookup(name)
+
+    def canonical(self, name: str) -> str:
+        # Anzeigename einer bekannten Zutat, sonst die getrimmte Eingabe
+        ident = self.registry.lookup(name)
+        return self.registry.names[ident] if ident is not None else " ".join(name.split())
+
+    def recipe_ingredients(self, name: str) -> list:
+        names = self.registry.names
+        return [names[i] for i in self.recipes.get(name, ())]
+
+    def is_available_id(self, ident: int) -> bool:
+        return bool(self.avail[ident])
+
+    def _forget_if_unused(self, ident: int):
+        # Nicht gelistet und von keinem Rezept verwendet: aus der Suche nehmen
+        if ident not in self.listed and ident not in self.users:
+            self.search.remove(ident)
+
+    # ---------- Änderungen ----------
+    def load(self, recipes: dict, ingredients: dict):
+        # Massenladen: erst Zutaten, dann Rezepte, damit die Zähler stimmen
+        for name, available in ingredients.items():
+            self.add_ingredient(name, available)
+        for name, zutaten in recipes.items():
+            self.add_recipe(name, zutaten)
+
+    def add_recipe(self, name: str, ingredients: list, keys: list = None):
+        # Bestehendes Rezept gleichen Namens wird ersetzt; keys: normalize_name
+        # der Zutaten, falls schon berechnet (Massenimport). Schreibweisen mit
+        # demselben Schlüssel zählen nur einmal, an der ersten Stelle (wie in
+        # der Datenbank nach der Migration auf Version 2)
+        if name in self.recipes:
+            self.remove_recipe(name)
+        if keys is None:
+            ids = array("I", dict.fromkeys(self._intern(z) for z in ingredients))
+        else:
+            ids = array("I", dict.fromkeys(map(self._intern, ingredients, keys)))
+        self.recipes[name] = ids
+        count = 0
+        for i in ids:
+            users = self.users.get(i)
+            if users is None:
+                users = self.users[i] = {}
+                self.search.add(i, self.registry.keys[i])
+            users[name] = users.get(name, 0) + 1
+            count += self.avail[i]
+        self.available[name] = count
+
+    def remove_recipe(self, name: str):
+        ids = self.recipes.pop(name)
+        del self.available[name]
+        for i in set(ids):
+            users = self.users[i]
+            del users[name]
+            if not users:
+                del self.users[i]
+                self._forget_if_unused(i)
+
+    def add_ingredient(self, name: str, available: bool = False) -> list:
+        ident = self._intern(name)
+        if ident not in self.listed:
+            self.listed[ident] = None
+            self.search.add(ident, self.registry.keys[ident])
+        return self.set_available(name, available)
+
+    def set_available(self, name: str, available: bool) -> list:
+        """
+        Setzt die Verfügbarkeit einer gelisteten Zutat.
+        Output: Namen der Rezepte, deren Zähler sich geändert hat
+        """
+        ident = self.registry.lookup(name)
+        if ident is None or ident not in self.listed:
+            return []
+        old = self.avail[ident]
+        if old == available:
+            return []
+        self.avail[ident] = available
+        users = self.users.get(ident, {})
+        delta = 1 if available else -1
+        for recipe, n in users.items():
+            self.available[recipe] += delta * n
+        return list(users)
+
+    def remove_ingredient(self, name: str) -> list:
+        # Eine gelöschte Zutat zählt wie eine fehlende
+        changed = self.set_available(name, False)
+        ident = self.registry.lookup(name)
+        del self.listed[ident]
+        self._forget_if_unused(ident)
+        return changed
+
+    # ---------- Abfragen ----------
+    def progress(self, name: str) -> tuple:
+        # (verfügbar, gesamt) in O(1)
+        return self.available.get(name, 0), len(self.recipes.get(name, ()))
+
+    def search_listed(self, query: str) -> list:
+        # Gelistete Zutaten, die zur Suchanfrage passen (Anzeigenamen)
+        names = self.registry.names
+        return [names[i] for i in self.search.search(query) if i in self.listed]
+
+    def suggest_known(self, name: str, threshold: float = 0.3):
+        """
+        Unscharfer Treffer für eine unbekannte Zutat (Tippfehler).
+        Output: Anzeigename der ähnlichsten bekannten Zutat oder None
+        """
+        if self.registry.lookup(name) is not None:
+            return None
+        best = self.search.similar(name, threshold=threshold, limit=1)
+        return self.registry.names[best[0][0]] if best else None
+
+# --- Kernobjekt: Index + Speicher + Planer ---
+# Zweck: alle Änderungen laufen hierüber, damit Index, Datenbank und Planer
+#        zusammenpassen; Verfügbarkeits-Schreibzugriffe werden bis flush() gesammelt
+# Name: EinkaufCore
+class EinkaufCore:
+    def __init__(self, store: RecipeStore = None):
+        self.store = store if store is not None else RecipeStore(DB_FILE)
+        self.index = RecipeIndex()
+        self.recipes = self.index.recipes
+        self.ingredients = self.index.ingredients
+        self._pending_available = {}  # {"Zutat": bool}, noch nicht gespeichert
+        self._planner = None
+        self._planner_checked = False
+
+    def load(self):
+        recipes, ingredients = self.store.load()
+        self.index.load(recipes, ingredients)
+        self._structure_changed()
+
+    def flush(self):
+        # Gesammelte Verfügbarkeiten in einer Transaktion schreiben
+        if self._pending_available:
+            self.store.set_available_many(self._pending_available.items())
+            self._pending_available = {}
+
+    def close(self):
+        self.flush()
+        self.store.close()
+
+    # ---------- Planer (NumPy, optional und erst bei Bedarf geladen) ----------
+    @property
+    def planner(self):
+        if not self._planner_checked:
+            self._planner_checked = True
+            from einkauf_plan import Planner
+            if Planner.available():
+                self._planner = Planner(self.index)
+        return self._planner
+
+    def _structure_changed(self):
+        if self._planner is not None:
+            self._planner.invalidate()
+
+    # ---------- Rezepte ----------
+    def add_recipe(self, name: str, ingredients: list):
+        self.add_recipes([(name, ingredients)])
+
+    def add_recipes(self, items, keys=None):
+        # Mehrere Rezepte: ein Indexdurchlauf, eine Transaktion
+        # keys: schon berechnete Zutatenschlüssel, parallel zu items (Massenimport)
+        items = list(items)
+        for k, (name, ingredients) in enumerate(items):
+            self.index.add_recipe(name, ingredients, None if keys is None else keys[k])
+        # In der Datenbank stehen die kanonischen Schreibweisen; die Schlüssel
+        # kennt das Register schon
+        registry_keys = self.index.registry.keys
+        self.store.save_recipes(
+            [(name, self.index.recipe_ingredients(name)) for name, _ in items],
+            [[registry_keys[i] for i in self.recipes[name]] for name, _ in items])
+        self._structure_changed()
+
+    def remove_recipe(self, name: str):
+        self.index.remove_recipe(name)
+        self.store.delete_recipe(name)
+        self._structure_changed()
+
+    # ---------- Zutaten ----------
+    def add_ingredients(self, items) -> set:
+        """
+        Legt Zutaten an bzw. setzt ihre Verfügbarkeit sofort (mit Speichern).
+        Output: Rezepte, deren Zähler sich geändert hat
+        """
+        changed = set()
+        rows = []
+        for name, available in items:
+            changed.update(self.index.add_ingredient(name, available))
+            name = self.index.canonical(name)
+            rows.append((name, available))
+            # Der neue Wert gewinnt gegen noch nicht gespeicherte Toggles
+            self._pending_available.pop(name, None)
+            if self._planner is not None:
+                self._planner.set_available(name, available)
+        self.store.add_ingredients(rows)
+        return changed
+
+    def set_available_many(self, items):
+        """
+        Setzt Verfügbarkeiten; gespeichert wird erst beim nächsten flush().
+        Output: (geänderte Zutaten als Anzeigenamen, Rezepte mit geändertem Zähler)
+        """
+        names, recipes = [], set()
+        for name, available in items:
+            if name not in self.ingredients or self.ingredients[name] == available:
+                continue
+            recipes.update(self.index.set_available(name, available))
+            name = self.index.canonical(name)
+            self._pending_available[name] = available
+            if self._planner is not None:
+                self._planner.set_available(name, available)
+            names.append(name)
+        return names, recipes
+
+    def remove_ingredients(self, names) -> set:
+        changed = set()
+        for name in names:
+            if name in self.ingredients:
+                name = self.index.canonical(name)
+                changed.update(self.index.remove_ingredient(name))
+                if self._planner is not None:
+                    self._planner.set_available(name, False)
+            # Noch nicht gespeicherte Toggles gelöschter Zutaten verwerfen
+            self._pending_available.pop(name, None)
+        self.store.delete_ingredients(names)
+        return changed
+
+    # ---------- Abfragen ----------
+    def recipe_status(self):
+        # (name, verfügbar, gesamt) für alle Rezepte, sortiert nach Name
+        for name in sorted(self.recipes):
+            available, total = self.index.progress(name)
+            yield name, available, total
+
+    def cookable(self, min_percent: float = 100.0) -> list:
+        return [name for name, available, total in self.recipe_status()
+                if total and available * 100 >= min_percent * total]
+
+    def missing(self, name: str) -> list:
+        names = self.index.registry.names
+        return [names[i] for i in dict.fromkeys(self.recipes[name])
+                if not self.index.is_available_id(i)]
+
+    # ---------- Import / Export ----------
+    def export_json(self, f, progress=None, cancelled=None) -> int:
+        # Flache Listen von (name, wert): nur Referenzen, keine Kopie der Daten
+        return einkauf_json.write_export(
+            f, list(self.recipes.items()), list(self.ingredients.items()),
+            progress=progress, cancelled=cancelled,
+            ingredient_names=self.index.registry.names)
+
+    def apply_import_batch(self, section: str, items: list) -> set:
+        """
+        Übernimmt einen Block aus einkauf_json.iter_import.
+        Output: Rezepte, deren Zähler sich geändert hat
+        """
+        if section == "recipes":
+            self.add_recipes(items)
+            return {name for name, _ in items}
+        return self.add_ingredients(items)
+
+    def import_json(self, f, progress=None) -> int:
+        count = 0
+        for section, items, pos in einkauf_json.iter_import(f):
+            self.apply_import_batch(section, items)
+            count += len(items)
+            if progress is not None:
+                progress(pos)
+        return count
+
+    def import_directory(self, directory: str, progress=None, errors=None) -> int:
+        """
+        Liest alle Rezeptdateien eines Verzeichnisses (siehe einkauf_bulk).
+        Input: progress(gelesene Bytes, gesamt) optional; errors: Liste für
+               (pfad, meldung) nicht lesbarer Dateien
+        Output: Anzahl übernommener Rezepte
+        """
+        count = 0
+        for items, keys, done, total in einkauf_bulk.iter_batches(directory, errors=errors):
+            self.add_recipes(items, keys)
+            count += len(items)
+            if progress is not None:
+                progress(done, total)
+        return count
+
+
+# --- Kommandozeile ---
+# Zweck: Stapelaufgaben ohne Qt (Rezepte abfragen, Verfügbarkeit setzen, Import/Export)
+# Name: main
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="einkauf_core", description="Einkaufsverwaltung ohne Oberfläche")
+    parser.add_argument("--db", default=DB_FILE, help=f"SQLite-Datei (Standard: {DB_FILE})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("recipes", help="Rezepte mit Fortschritt auflisten")
+    p.add_argument("--cookable", action="store_true", help="nur vollständig kochbare Rezepte")
+    p.add_argument("--min-percent", type=float, default=None, help="nur Rezepte ab diesem Fortschritt")
+
+    p = sub.add_parser("missing", help="fehlende Zutaten eines Rezepts")
+    p.add_argument("recipe")
+
+    p = sub.add_parser("plan", help="Einkaufsvorschlag: welche Zutaten lohnen sich (NumPy)")
+    p.add_argument("-k", type=int, default=5)
+
+    p = sub.add_parser("mark", help="Zutaten als verfügbar (oder mit --off als fehlend) markieren")
+    p.add_argument("ingredients", nargs="+")
+    p.add_argument("--off", action="store_true")
+
+    p = sub.add_parser("export", help="Bestand als JSON exportieren")
+    p.add_argument("file")
+
+    p = sub.add_parser("import", help="JSON-Export einlesen")
+    p.add_argument("file")
+
+    p = sub.add_parser("import-dir", help="Rezeptdateien eines Verzeichnisses einlesen (.txt, .csv, .json)")
+    p.add_argument("directory")
+
+    args = parser.parse_args(argv)
+    core = EinkaufCore(RecipeStore(args.db))
+    try:
+        core.load()
+        if args.command == "recipes":
+            if args.cookable or args.min_percent is not None:
+                threshold = 100.0 if args.min_percent is None else args.min_percent
+                for name in core.cookable(threshold):
+                    print(name)
+            else:
+                for name, available, total in core.recipe_status():
+                    print(f"{name}\t{available}/{total}")
+        elif args.command == "missing":
+            if args.recipe not in core.recipes:
+                print(f"Rezept nicht gefunden: {args.recipe}", file=sys.stderr)
+                return 1
+            for z in core.missing(args.recipe):
+                print(z)
+        elif args.command == "plan":
+            if core.planner is None:
+                print("NumPy ist nicht installiert – Einkaufsplaner deaktiviert.", file=sys.stderr)
+                return 1
+            for name, unlocked, cookable in core.planner.suggest(args.k):
+                print(f"{name}\t+{unlocked}\t{cookable}")
+        elif args.command == "mark":
+            # Unbekannte Zutaten werden angelegt, bekannte nur umgeschaltet
+            new = [z for z in args.ingredients if z not in core.ingredients]
+            core.add_ingredients((z, False) for z in new)
+            core.set_available_many((z, not args.off) for z in args.ingredients)
+        elif args.command == "export":
+            with open(args.file, "w", encoding="utf-8") as f:
+                count = core.export_json(f)
+            print(f"{count} Einträge exportiert")
+        elif args.command == "import":
+            try:
+                with open(args.file, "rb") as f:
+                    count = core.import_json(f)
+            except (OSError, ValueError) as e:
+                print(f"Import fehlgeschlagen: {e}", file=sys.stderr)
+                return 1
+            print(f"{count} Einträge importiert")
+        elif args.command == "import-dir":
+            errors = []
+            count = core.import_directory(args.directory, errors=errors)
+            for path, msg in errors:
+                print(f"übersprungen: {path}: {msg}", file=sys.stderr)
+            print(f"{count} Rezepte importiert")
+    finally:
+        core.close()
+    return 0
+
+
+# Wenn diese Datei direkt ausgeführt wird, starte die Kommandozeile.
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1081 @@
+# --- Importe und Setup (Definitionen)) ---
+# Dieser Block importiert die notwendigen Qt-Module und Standardbibliotheken.
+# Name: Importe_und_Setup
+import sys
+import os
+import bisect
+import heapq
+import re
+import threading
+from PySide6 import QtCore, QtWidgets, QtGui
+
+import einkauf_bulk
+import einkauf_json
+import ui_trace
+from einkauf_core import EinkaufCore, RecipeIndex
+from einkauf_names import matches, normalize_name, parse_ingredients
+from einkauf_store import RecipeStore
+
+# --- Hilfsfunktion: Farbinterpolation (rot → gelb → grün) ---
+# Zweck: berechnet die RGB-Farbe für einen Prozentsatz 0..100
+# Name: farbinterpolation
+def progress_color(percent: float) -> str:
+    """
+    Interpoliert eine Farbe entlang Rot -> Gelb -> Grün.
+    Input: percent 0..100
+    Output: CSS rgb(...) string
+    """
+    p = max(0.0, min(100.0, percent))
+    if p <= 50:
+        # Rot (255,0,0) -> Gelb (255,255,0)
+        ratio = p / 50.0
+        r = 255
+        g = int(0 + ratio * 255)
+        b = 0
+    else:
+        # Gelb (255,255,0) -> Grün (0,255,0)
+        ratio = (p - 50.0) / 50.0
+        r = int(255 - ratio * 255)
+        g = 255
+        b = 0
+    return f"rgb({r},{g},{b})"
+
+# --- Farbtabelle: vorberechnete Farben/Pinsel für 0..100 % ---
+# Zweck: progress_color einmal pro Prozentwert auswerten statt bei jedem Zeichnen
+# Name: farbtabelle
+def _qcolor_from_css(css: str) -> QtGui.QColor:
+    r, g, b = (int(v) for v in css[4:-1].split(","))
+    return QtGui.QColor(r, g, b)
+
+PROGRESS_COLORS = [_qcolor_from_css(progress_color(p)) for p in range(101)]
+PROGRESS_BRUSHES = [QtGui.QBrush(c) for c in PROGRESS_COLORS]
+
+# --- Qt-Modell: sortierte Namensliste (Basis für Rezept- und Zutatenliste) ---
+# Zweck: hält die Namen sortiert und meldet Einfügen/Löschen zeilengenau,
+#        statt die ganze Liste neu aufzubauen
+# Name: SortedNameModel
+class SortedNameModel(QtCore.QAbstractListModel):
+    def __init__(self, index: RecipeIndex, parent=None):
+        super().__init__(parent)
+        self._index = index
+        self._names = []  # sortiert, wie sorted() es liefern würde
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def data(self, idx, role=QtCore.Qt.DisplayRole):
+        if not idx.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            return self._names[idx.row()]
+        return None
+
+    def name_at(self, row: int) -> str:
+        return self._names[row]
+
+    def row_of(self, name: str) -> int:
+        # Binärsuche in der sortierten Liste, -1 wenn nicht vorhanden
+        row = bisect.bisect_left(self._names, name)
+        if row < len(self._names) and self._names[row] == name:
+            return row
+        return -1
+
+    def set_names(self, names):
+        # Kompletter Neuaufbau, nur für Massenladen gedacht
+        self.beginResetModel()
+        self._names = sorted(names)
+        self.endResetModel()
+
+    def insert_name(self, name: str):
+        row = bisect.bisect_left(self._names, name)
+        if row < len(self._names) and self._names[row] == name:
+            # Existiert schon: nur Inhalt als geändert melden
+            self.name_changed(name)
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._names.insert(row, name)
+        self.endInsertRows()
+
+    def remove_names(self, names):
+        # Zeilen von hinten nach vorne entfernen, zusammenhängende Blöcke auf einmal;
+        # aufsteigend sortiert, damit pop() am Ende der Liste nimmt (linear)
+        rows = sorted(r for r in map(self.row_of, set(names)) if r >= 0)
+        while rows:
+            last = first = rows.pop()
+            while rows and rows[-1] == first - 1:
+                first = rows.pop()
+            self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+            del self._names[first:last + 1]
+            self.endRemoveRows()
+
+    def insert_names(self, names):
+        # Blockweises Einfügen: wenige neue Namen zeilenweise, viele per Zusammenführen
+        new = sorted(set(n for n in names if self.row_of(n) < 0))
+        if len(new) <= 64:
+            for name in new:
+                self.insert_name(name)
+            return
+        self.beginResetModel()
+        self._names = list(heapq.merge(self._names, new))
+        self.endResetModel()
+
+    def all_changed(self):
+        if self._names:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._names) - 1, 0))
+
+    def name_changed(self, name: str):
+        row = self.row_of(name)
+        if row >= 0:
+            idx = self.index(row, 0)
+            self.dataChanged.emit(idx, idx)
+
+# --- Qt-Modell: Rezeptliste ---
+# Zweck: alle Rezeptnamen, sortiert
+# Name: RecipeListModel
+class RecipeListModel(SortedNameModel):
+    # Fortschritt in ganzen Prozent (0..100) oder None ohne Zutaten
+    ProgressRole = QtCore.Qt.UserRole + 1
+
+    def data(self, idx, role=QtCore.Qt.DisplayRole):
+        if idx.isValid() and role == self.ProgressRole:
+            available, total = self._index.progress(self._names[idx.row()])
+            return (available * 100) // total if total else None
+        return super().data(idx, role)
+
+# --- Delegate: kleiner Fortschrittsbalken pro Rezeptzeile ---
+# Zweck: zeichnet neben jedem Rezeptnamen einen Balken in der Fortschrittsfarbe;
+#        Farben und Pinsel kommen aus der Tabelle, es werden keine Stylesheets gesetzt
+# Name: RecipeProgressDelegate
+class RecipeProgressDelegate(QtWidgets.QStyledItemDelegate):
+    BAR_WIDTH = 60
+    MARGIN = 4
+    TRACK_BRUSH = QtGui.QBrush(QtGui.QColor(255, 255, 255, 24))
+
+    def paint(self, painter, option, index):
+        bar = QtCore.QRect(option.rect)
+        bar.setLeft(bar.right() - self.BAR_WIDTH - self.MARGIN)
+        bar.adjust(0, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        # Text nur links vom Balken zeichnen lassen
+        text_option = QtWidgets.QStyleOptionViewItem(option)
+        text_option.rect = option.rect.adjusted(0, 0, -(self.BAR_WIDTH + 2 * self.MARGIN), 0)
+        super().paint(painter, text_option, index)
+
+        percent = index.data(RecipeListModel.ProgressRole)
+        painter.save()
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.fillRect(bar, self.TRACK_BRUSH)
+        if percent:
+            fill = QtCore.QRect(bar)
+            fill.setWidth(max(1, bar.width() * percent // 100))
+            painter.fillRect(fill, PROGRESS_BRUSHES[percent])
+        painter.restore()
+
+# --- Qt-Modell: Zutatenliste mit Checkboxen ---
+# Zweck: zeigt Zutaten mit Verfügbarkeits-Haken; ein Klick auf den Haken
+#        wird als Signal an das Hauptfenster weitergereicht
+# Name: IngredientListModel
+class IngredientListModel(SortedNameModel):
+    availability_changed = QtCore.Signal(str, bool)
+
+    def __init__(self, index: RecipeIndex, parent=None):
+        super().__init__(index, parent)
+        self._all = []       # alle Namen, sortiert; _names ist die gefilterte Sicht
+        self._query = None   # normalisierte Suchanfrage oder None
+
+    # ---------- Filter (Suche beim Tippen) ----------
+    def set_filter(self, query: str):
+        # Kandidaten kommen aus dem Trigramm-Index, nicht aus einem Durchlauf über alle
+        query = normalize_name(query)
+        self.beginResetModel()
+        if query:
+            self._query = query
+            self._names = sorted(self._index.search_listed(query))
+        else:
+            self._query = None
+            self._names = list(self._all)
+        self.endResetModel()
+
+    def _visible(self, name: str) -> bool:
+        return self._query is None or matches(self._query, normalize_name(name))
+
+    def set_names(self, names):
+        self._all = sorted(names)
+        super().set_names([n for n in self._all if self._visible(n)])
+
+    def insert_name(self, name: str):
+        row = bisect.bisect_left(self._all, name)
+        if row == len(self._all) or self._all[row] != name:
+            self._all.insert(row, name)
+        if self._visible(name):
+            super().insert_name(name)
+
+    def insert_names(self, names):
+        known = self._all
+        new = sorted(n for n in set(names)
+                     if (i := bisect.bisect_left(known, n)) == len(known) or known[i] != n)
+        self._all = list(heapq.merge(self._all, new))
+        super().insert_names([n for n in new if self._visible(n)])
+
+    def remove_names(self, names):
+        gone = set(names)
+        self._all = [n for n in self._all if n not in gone]
+        super().remove_names(names)
+
+    def flags(self, idx):
+        return super().flags(idx) | QtCore.Qt.ItemIsUserCheckable
+
+    def data(self, idx, role=QtCore.Qt.DisplayRole):
+        if idx.isValid() and role == QtCore.Qt.CheckStateRole:
+            available = self._index.ingredients.get(self._names[idx.row()], False)
+            return QtCore.Qt.Checked if available else QtCore.Qt.Unchecked
+        return super().data(idx, role)
+
+    def setData(self, idx, value, role=QtCore.Qt.EditRole):
+        if not idx.isValid() or role != QtCore.Qt.CheckStateRole:
+            return False
+        checked = QtCore.Qt.CheckState(value) == QtCore.Qt.Checked
+        self.availability_changed.emit(self._names[idx.row()], checked)
+        return True
+
+# --- Qt-Modell: Zutaten des ausgewählten Rezepts ---
+# Zweck: Zutatenanzeige mit Status-Text und Farbe; Farben werden einmal angelegt
+# Name: RecipeIngredientsModel
+class RecipeIngredientsModel(QtCore.QAbstractListModel):
+    # hellgrün/hellrot für schnelle Lesbarkeit
+    AVAILABLE_BRUSH = QtGui.QBrush(QtGui.QColor(180, 255, 180))
+    MISSING_BRUSH = QtGui.QBrush(QtGui.QColor(255, 180, 180))
+
+    def __init__(self, index: RecipeIndex, parent=None):
+        super().__init__(parent)
+        self._index = index
+        self._ingredients = []  # Zutaten-IDs des Rezepts
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._ingredients)
+
+    def data(self, idx, role=QtCore.Qt.DisplayRole):
+        if not idx.isValid():
+            return None
+        ident = self._ingredients[idx.row()]
+        if role == QtCore.Qt.DisplayRole:
+            avail = self._index.is_available_id(ident)
+            return f"{self._index.registry.display(ident)} — {'verfügbar' if avail else 'fehlend'}"
+        if role == QtCore.Qt.ForegroundRole:
+            avail = self._index.is_available_id(ident)
+            return self.AVAILABLE_BRUSH if avail else self.MISSING_BRUSH
+        return None
+
+    def set_ingredients(self, ingredient_ids):
+        # Ein Rezept hat wenige Zutaten: Reset ist hier billig
+        self.beginResetModel()
+        self._ingredients = list(ingredient_ids)
+        self.endResetModel()
+
+    def all_changed(self):
+        if self._ingredients:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._ingredients) - 1, 0))
+
+
+# --- Hintergrundarbeit: Signale der JSON-Aufgaben ---
+# Zweck: QRunnable ist kein QObject; die Signale hängen an einem eigenen Objekt
+# Name: JsonTaskSignals
+class JsonTaskSignals(QtCore.QObject):
+    progress = QtCore.Signal(int, int)        # erledigt, gesamt
+    batch = QtCore.Signal(str, object)        # abschnitt, [(name, wert), ...]
+    finished = QtCore.Signal(int, bool)       # Anzahl Einträge, abgebrochen
+    failed = QtCore.Signal(str)
+
+# --- Hintergrundarbeit: JSON-Export ---
+# Zweck: schreibt den Export im QThreadPool, blockweise und abbrechbar
+# Name: JsonExportTask
+class JsonExportTask(QtCore.QRunnable):
+    def __init__(self, fname: str, recipes: list, ingredients: list, ingredient_names: list):
+        super().__init__()
+        # Python besitzt das Objekt (Signale/Closures halten Referenzen darauf)
+        self.setAutoDelete(False)
+        self.fname = fname
+        # Flache Listen von (name, wert): nur Referenzen, keine Kopie der Daten
+        self.recipes = recipes
+        self.ingredients = ingredients
+        self.ingredient_names = ingredient_names  # Register: Rezepte speichern IDs
+        self.signals = JsonTaskSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        tmp = self.fname + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                count = einkauf_json.write_export(
+                    f, self.recipes, self.ingredients,
+                    progress=self.signals.progress.emit, cancelled=self._cancel.is_set,
+                    ingredient_names=self.ingredient_names)
+            # Erst nach vollständigem Schreiben die Zieldatei ersetzen
+            os.replace(tmp, self.fname)
+            self.signals.finished.emit(count, False)
+        except einkauf_json.Cancelled:
+            os.remove(tmp)
+            self.signals.finished.emit(0, True)
+        except Exception as e:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            self.signals.failed.emit(str(e))
+
+# --- Hintergrundarbeit: JSON-Import ---
+# Zweck: liest die Datei inkrementell und reicht Blöcke an den GUI-Thread weiter;
+#        höchstens MAX_PENDING Blöcke sind unterwegs, damit der Speicher begrenzt bleibt
+# Name: JsonImportTask
+class JsonImportTask(QtCore.QRunnable):
+    MAX_PENDING = 4
+
+    def __init__(self, fname: str):
+        super().__init__()
+        # Python besitzt das Objekt (Signale/Closures halten Referenzen darauf)
+        self.setAutoDelete(False)
+        self.fname = fname
+        self.signals = JsonTaskSignals()
+        self._cancel = threading.Event()
+        self._pending = threading.Semaphore(self.MAX_PENDING)
+
+    def cancel(self):
+        self._cancel.set()
+        self._pending.release()
+
+    def batch_done(self):
+        # Vom GUI-Thread aufgerufen, wenn ein Block übernommen wurde
+        self._pending.release()
+
+    def run(self):
+        count = 0
+        try:
+            size = os.path.getsize(self.fname)
+            with open(self.fname, "rb") as f:
+                for section, batch, pos in einkauf_json.iter_import(f, cancelled=self._cancel.is_set):
+                    self._pending.acquire()
+                    if self._cancel.is_set():
+                        raise einkauf_json.Cancelled()
+                    self.signals.batch.emit(section, batch)
+                    count += len(batch)
+                    self.signals.progress.emit(pos, size)
+            self.signals.finished.emit(count, False)
+        except einkauf_json.Cancelled:
+            self.signals.finished.emit(count, True)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+# --- Hintergrundarbeit: Rezeptverzeichnis importieren ---
+# Zweck: verteilt das Lesen auf einen Prozess-Pool (einkauf_bulk) und reicht große
+#        Blöcke an den GUI-Thread weiter; wie beim JSON-Import höchstens MAX_PENDING
+# Name: BulkImportTask
+class BulkImportTask(JsonImportTask):
+    """
+    batch liefert ("recipes", (rezepte, schlüssel)); am Ende stehen nicht
+    lesbare Dateien als (pfad, meldung) in errors.
+    """
+    def __init__(self, directory: str):
+        super().__init__(directory)
+        self.errors = []
+
+    def run(self):
+        count = 0
+        try:
+            for items, keys, done, total in einkauf_bulk.iter_batches(
+                    self.fname, cancelled=self._cancel.is_set, errors=self.errors):
+                self._pending.acquire()
+                if self._cancel.is_set():
+                    raise einkauf_json.Cancelled()
+                self.signals.batch.emit("recipes", (items, keys))
+                count += len(items)
+                # Fortschritt in KiB: Signale tragen 32-Bit-Zahlen
+                self.signals.progress.emit(done >> 10, total >> 10)
+            self.signals.finished.emit(count, False)
+        except einkauf_json.Cancelled:
+            self.signals.finished.emit(count, True)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+# --- Hauptfensterklasse: GUI, Logik, Verknüpfungen ---
+# Zweck: definiert das Hauptfenster mit allen Widgets und Verhalten.
+# Name: MainWindow (Hauptklasse)
+class MainWindow(QtWidgets.QMainWindow):
+    # Ab so vielen geänderten Zeilen wird ein einziges dataChanged über die ganze Liste gemeldet
+    BULK_REFRESH = 64
+
+    def __init__(self, store: RecipeStore = None):
+        # Konstruktor: GUI initialisieren
+        super().__init__()
+        self.setWindowTitle("Einkaufsverwaltung — Rezepte & Zutaten")
+        # Setze dunklen blauen Hintergrund und weiße Schrift
+        self.setStyleSheet("""
+            QMainWindow { background-color: #001f3f; color: #ffffff; }
+
+            QLabel { color: #ffffff; }
+
+            QLineEdit, QTextEdit, QListView {
+                color: #ffffff;               /* Text weiß */
+                background-color: #002b59;     /* dunkleres Blau, sichtbar */
+                border: 1px solid #00509e;
+            }
+
+            QPushButton {
+                color: #ffffff;
+                background-color: #003366;
+            }
+
+            QProgressBar {
+                color: #ffffff;
+            }
+        """)
+
+        # Datenmodelle: Rezepte als dict; Zutaten als dict (verfügbar: bool)
+        # Alles gehört dem Qt-freien Kern (Index, SQLite-Ablage, Planer);
+        # das Fenster liest daraus und leitet Änderungen dorthin weiter
+        self.core = EinkaufCore(store)
+        self.index = self.core.index
+        self.store = self.core.store
+        self.recipes = self.core.recipes          # {"Rezeptname": ["zut1","zut2",...]}
+        self.ingredients = self.core.ingredients  # {"Zutat": bool}
+        # Qt-Modelle über dem Index (sortiert, zeilengenaue Änderungen)
+        self.recipe_model = RecipeListModel(self.index, self)
+        self.ingredient_model = IngredientListModel(self.index, self)
+        self.recipe_ingredients_model = RecipeIngredientsModel(self.index, self)
+        self._current_recipe = None  # Name des angezeigten Rezepts
+        self._tasks = set()  # laufende Hintergrundaufgaben (Import/Export)
+        # Einkaufsplaner über alle Rezepte (nur mit NumPy)
+        self.planner = self.core.planner
+
+        # Sammelstellen für Änderungen: werden einmal pro Event-Loop-Durchlauf
+        # abgearbeitet (ein Speichern, ein Neuzeichnen), egal wie viele Toggles kamen
+        self._dirty_ingredients = set()  # Zutaten mit geänderter Anzeige
+        self._dirty_recipes = set()      # Rezepte mit geändertem Zähler
+        self._dirty_structure = False    # Rezepte hinzugefügt/entfernt (Planer neu aufbauen)
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(ui_trace.slot(self._flush_pending))
+
+        # Aufbau der UI
+        self._create_widgets()
+        self._create_layout()
+        self._connect_signals()
+        self._load_from_store()
+
+    # --- Startzustand aus der Datenbank laden ---
+    # Zweck: füllt Index und Listen einmalig mit dem gespeicherten Bestand
+    # Name: _load_from_store
+    def _load_from_store(self):
+        self.core.load()
+        self._refresh_recipe_list()
+        self._refresh_ingredient_list()
+        self._dirty_structure = True
+        self._flush_pending()
+
+    # --- Fenster schließen ---
+    # Zweck: Datenbankverbindung sauber beenden
+    # Name: closeEvent
+    def closeEvent(self, event):
+        # Laufende Import-/Exportaufgaben abbrechen, bevor die Datenbank schließt
+        for task in list(self._tasks):
+            task.cancel()
+        QtCore.QThreadPool.globalInstance().waitForDone()
+        # Gesammelte Änderungen noch schreiben
+        self._flush_timer.stop()
+        self._flush_pending()
+        self.core.close()
+        super().closeEvent(event)
+
+    # --- Widgets erzeugen (Definitionen) ---
+    # Zweck: instanziiert alle Widgets
+    # Name: _create_widgets
+    def _create_widgets(self):
+        # Rezeptbereich (links oben): Eingabe für Rezeptname + Zutaten
+        self.recipe_name_edit = QtWidgets.QLineEdit()
+        self.recipe_name_edit.setPlaceholderText("Rezeptname")
+        self.recipe_ingredients_edit = QtWidgets.QTextEdit()
+        self.recipe_ingredients_edit.setPlaceholderText("Zutaten, durch Komma getrennt (z.B. Eier, Mehl, Milch)")
+        self.add_recipe_btn = QtWidgets.QPushButton("Rezept hinzufügen")
+        self.bulk_import_btn = QtWidgets.QPushButton("Rezeptordner importieren …")
+
+        # Rezeptliste (links mitte): zeigt alle Rezepte an
+        # QListView mit einheitlicher Zeilenhöhe: nur sichtbare Zeilen werden angefasst
+        self.recipe_list = QtWidgets.QListView()
+        self.recipe_list.setUniformItemSizes(True)
+        self.recipe_list.setModel(self.recipe_model)
+        self.recipe_list.setItemDelegate(RecipeProgressDelegate(self.recipe_list))
+
+        # Anzeige (Mitte): zeigt Details des ausgewählten Rezepts
+        self.current_recipe_label = QtWidgets.QLabel("Kein Rezept ausgewählt")
+        font = self.current_recipe_label.font()
+        font.setPointSize(12)
+        font.setBold(True)
+        self.current_recipe_label.setFont(font)
+        # Fortschrittsbalken unter dem Rezeptnamen
+        self.recipe_progress = QtWidgets.QProgressBar()
+        self.recipe_progress.setRange(0, 100)
+        self.recipe_progress.setTextVisible(True)
+        # Rahmen einmalig per Stylesheet; die Füllfarbe kommt über die Palette
+        # (kein ::chunk-Eintrag, sonst würde die Palette ignoriert)
+        self.recipe_progress.setStyleSheet("""
+            QProgressBar {
+                border: 1px solid rgba(255,255,255,0.12);
+                border-radius: 4px;
+                background: rgba(255,255,255,0.03);
+                text-align: center;
+            }
+        """)
+        # Zutatenauflistung für das Rezept: Liste mit Verfügbarkeitsanzeige
+        self.recipe_ingredients_view = QtWidgets.QListView()
+        self.recipe_ingredients_view.setUniformItemSizes(True)
+        self.recipe_ingredients_view.setModel(self.recipe_ingredients_model)
+
+        # Einkaufsplaner (Mitte, neben der Zutatenanzeige): welche k Zutaten lohnen sich
+        self.plan_k_spin = QtWidgets.QSpinBox()
+        self.plan_k_spin.setRange(1, 20)
+        self.plan_k_spin.setValue(5)
+        self.plan_summary_label = QtWidgets.QLabel()
+        self.plan_summary_label.setWordWrap(True)
+        self.plan_list = QtWidgets.QListWidget()
+
+        # Zutatenverwaltung (rechts): Zutat hinzufügen + Verfügbarkeitsliste
+        self.ingredient_name_edit = QtWidgets.QLineEdit()
+        self.ingredient_name_edit.setPlaceholderText("Zutatenname")
+        self.add_ingredient_btn = QtWidgets.QPushButton("Zutat hinzufügen")
+        # Zutatenliste: mit Checkboxen (Verfügbar/fehlend)
+        # Suche beim Tippen über den Trigramm-Index
+        self.ingredient_filter_edit = QtWidgets.QLineEdit()
+        self.ingredient_filter_edit.setPlaceholderText("Zutaten filtern …")
+        self.ingredient_filter_edit.setClearButtonEnabled(True)
+        self.ingredient_list = QtWidgets.QListView()
+        self.ingredient_list.setUniformItemSizes(True)
+        self.ingredient_list.setModel(self.ingredient_model)
+        # Mehrfachauswahl: Grundlage für "Zutat löschen" und "Auswahl umschalten"
+        self.ingredient_list.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        # Sammelaktionen für viele Zutaten auf einmal
+        self.mark_all_btn = QtWidgets.QPushButton("Alle verfügbar")
+        self.mark_none_btn = QtWidgets.QPushButton("Keine verfügbar")
+        self.toggle_selected_btn = QtWidgets.QPushButton("Auswahl umschalten")
+        self.paste_list_btn = QtWidgets.QPushButton("Einkaufsliste einfügen …")
+
+        # Buttons unten: Rezept löschen, Zutat löschen, Export (klein)
+        self.delete_recipe_btn = QtWidgets.QPushButton("Rezept löschen")
+        self.delete_ingredient_btn = QtWidgets.QPushButton("Zutat löschen (markierte)")
+        self.export_btn = QtWidgets.QPushButton("Export (JSON)")
+        self.import_btn = QtWidgets.QPushButton("Import (JSON)")
+
+    # --- Layout erstellen (Hauptschleife UI-Aufbau) ---
+    # Zweck: arrangiert Widgets in Layouts
+    # Name: _create_layout
+    def _create_layout(self):
+        # Linke Spalte: Rezept erstellen + Liste
+        recipe_group = QtWidgets.QGroupBox("Rezepte erstellen & Liste")
+        left_v = QtWidgets.QVBoxLayout()
+        left_v.addWidget(QtWidgets.QLabel("Neues Rezept:"))
+        left_v.addWidget(self.recipe_name_edit)
+        left_v.addWidget(self.recipe_ingredients_edit)
+        left_v.addWidget(self.add_recipe_btn)
+        left_v.addWidget(self.bulk_import_btn)
+        left_v.addWidget(QtWidgets.QLabel("Alle Rezepte:"))
+        left_v.addWidget(self.recipe_list)
+        left_v.addWidget(self.delete_recipe_btn)
+        recipe_group.setLayout(left_v)
+
+        # Mittlere Spalte: Rezeptdetails
+        detail_group = QtWidgets.QGroupBox("Rezeptdetails")
+        mid_v = QtWidgets.QVBoxLayout()
+        mid_v.addWidget(self.current_recipe_label)
+        mid_v.addWidget(self.recipe_progress)
+        details_h = QtWidgets.QHBoxLayout()
+        status_v = QtWidgets.QVBoxLayout()
+        status_v.addWidget(QtWidgets.QLabel("Zutaten (Status):"))
+        status_v.addWidget(self.recipe_ingredients_view)
+        details_h.addLayout(status_v, 3)
+        # Einkaufsvorschlag neben der Zutatenanzeige
+        plan_v = QtWidgets.QVBoxLayout()
+        plan_k_h = QtWidgets.QHBoxLayout()
+        plan_k_h.addWidget(QtWidgets.QLabel("Einkaufsvorschlag, Anzahl:"))
+        plan_k_h.addWidget(self.plan_k_spin)
+        plan_v.addLayout(plan_k_h)
+        plan_v.addWidget(self.plan_summary_label)
+        plan_v.addWidget(self.plan_list)
+        details_h.addLayout(plan_v, 2)
+        mid_v.addLayout(details_h)
+        detail_group.setLayout(mid_v)
+
+        # Rechte Spalte: Zutatenverwaltung
+        ingredient_group = QtWidgets.QGroupBox("Zutatenverwaltung")
+        right_v = QtWidgets.QVBoxLayout()
+        right_v.addWidget(QtWidgets.QLabel("Neue Zutat:"))
+        right_v.addWidget(self.ingredient_name_edit)
+        right_v.addWidget(self.add_ingredient_btn)
+        right_v.addWidget(QtWidgets.QLabel("Zutaten (Verfügbar = Haken setzen):"))
+        right_v.addWidget(self.ingredient_filter_edit)
+        right_v.addWidget(self.ingredient_list)
+        bulk_grid = QtWidgets.QGridLayout()
+        bulk_grid.addWidget(self.mark_all_btn, 0, 0)
+        bulk_grid.addWidget(self.mark_none_btn, 0, 1)
+        bulk_grid.addWidget(self.toggle_selected_btn, 1, 0)
+        bulk_grid.addWidget(self.paste_list_btn, 1, 1)
+        right_v.addLayout(bulk_grid)
+        right_v.addWidget(self.delete_ingredient_btn)
+        right_v.addWidget(self.export_btn)
+        right_v.addWidget(self.import_btn)
+        ingredient_group.setLayout(right_v)
+
+        # Hauptlayout: drei Spalten
+        central = QtWidgets.QWidget()
+        main_h = QtWidgets.QHBoxLayout()
+        main_h.addWidget(recipe_group, 3)
+        main_h.addWidget(detail_group, 4)
+        main_h.addWidget(ingredient_group, 3)
+        central.setLayout(main_h)
+        self.setCentralWidget(central)
+
+    # --- Signale & Slots verbinden (Interaktivität) ---
+    # Zweck: verknüpft Buttons/Listen mit Methoden
+    # Name: _connect_signals
+    def _connect_signals(self):
+        # Ohne UI_TRACE gibt slot() die Methode unverändert zurück
+        slot = ui_trace.slot
+        self.add_recipe_btn.clicked.connect(slot(self.add_recipe))
+        self.add_ingredient_btn.clicked.connect(slot(self.add_ingredient))
+        self.recipe_list.selectionModel().selectionChanged.connect(slot(self.on_recipe_selected))
+        self.ingredient_model.availability_changed.connect(slot(self.on_ingredient_toggled))
+        self.delete_recipe_btn.clicked.connect(slot(self.delete_selected_recipe))
+        self.delete_ingredient_btn.clicked.connect(slot(self.delete_marked_ingredients))
+        self.mark_all_btn.clicked.connect(slot(self.mark_all_available))
+        self.mark_none_btn.clicked.connect(slot(self.mark_none_available))
+        self.toggle_selected_btn.clicked.connect(slot(self.toggle_selected_ingredients))
+        self.paste_list_btn.clicked.connect(slot(self.paste_shopping_list))
+        self.ingredient_filter_edit.textChanged.connect(slot(self.ingredient_model.set_filter))
+        self.export_btn.clicked.connect(slot(self.export_json))
+        self.import_btn.clicked.connect(slot(self.import_json))
+        self.bulk_import_btn.clicked.connect(slot(self.import_directory))
+        self.plan_k_spin.valueChanged.connect(slot(self._refresh_plan))
+
+    # --- Logik: Rezept hinzufügen ---
+    # Zweck: Liest Felder, speichert Rezept und aktualisiert UI
+    # Name: add_recipe
+    def add_recipe(self):
+        name = self.recipe_name_edit.text().strip()
+        if not name:
+            QtWidgets.QMessageBox.warning(self, "Fehler", "Bitte einen Rezeptnamen eingeben.")
+            return
+        # Zutaten durch Komma trennen, trimmen, leere entfernen
+        raw = self.recipe_ingredients_edit.toPlainText()
+        ingredients = parse_ingredients(raw)
+        ingredients = self._confirm_fuzzy_matches(ingredients)
+        # Speichere Rezept (überschreibt bestehendes mit gleichem Namen)
+        self.core.add_recipe(name, ingredients)
+        # Nur eine Zeile einfügen statt die ganze Liste neu aufzubauen
+        self.recipe_model.insert_name(name)
+        self._mark_structure_changed()
+        if name == self._current_recipe:
+            self._show_recipe_details(name)
+        # Reset Eingabefelder
+        self.recipe_name_edit.clear()
+        self.recipe_ingredients_edit.clear()
+
+    # --- Tippfehler in Rezeptzutaten ---
+    # Zweck: unbekannte Zutaten, die einer bekannten sehr ähneln, nach Rückfrage
+    #        durch die bekannte ersetzen ("Tomaten" statt "Tomatn")
+    # Name: _confirm_fuzzy_matches
+    def _confirm_fuzzy_matches(self, ingredients: list) -> list:
+        hints = {}
+        for z in ingredients:
+            known = self.index.suggest_known(z)
+            if known is not None:
+                hints[z] = known
+        if not hints:
+            return ingredients
+        text = "\n".join(f"{z} → {known}" for z, known in hints.items())
+        answer = QtWidgets.QMessageBox.question(
+            self, "Ähnliche Zutaten", f"Unbekannte Zutaten durch bekannte ersetzen?\n\n{text}")
+        if answer != QtWidgets.QMessageBox.Yes:
+            return ingredients
+        return list(dict.fromkeys(hints.get(z, z) for z in ingredients))
+
+    # --- UI-Aktualisierung: Rezeptliste neu aufbauen ---
+    # Zweck: setzt das Rezeptmodell komplett neu (nur für Massenladen)
+    # Name: _refresh_recipe_list
+    def _refresh_recipe_list(self):
+        self.recipe_model.set_names(self.recipes.keys())
+
+    # --- Logik: Zutat hinzufügen ---
+    # Zweck: Zutat in ingredients dict hinzufügen (standard: nicht verfügbar)
+    # Name: add_ingredient
+    def add_ingredient(self):
+        name = self.ingredient_name_edit.text().strip()
+        if not name:
+            QtWidgets.QMessageBox.warning(self, "Fehler", "Bitte einen Zutatenamen eingeben.")
+            return
+        if name in self.ingredients:
+            QtWidgets.QMessageBox.information(self, "Hinweis", "Zutat existiert bereits.")
+            return
+        # Standardmäßig nicht verfügbar (False)
+        self.core.add_ingredients([(name, False)])
+        name = self.index.canonical(name)
+        self.ingredient_model.insert_name(name)
+        self.ingredient_name_edit.clear()
+        self._dirty_ingredients.add(name)
+        self._schedule_flush()
+
+    # --- UI-Aktualisierung: Zutatenliste neu aufbauen (mit Checkboxen) ---
+    # Zweck: setzt das Zutatenmodell komplett neu (nur für Massenladen)
+    # Name: _refresh_ingredient_list
+    def _refresh_ingredient_list(self):
+        self.ingredient_model.set_names(self.ingredients.keys())
+
+    # --- Reaktion auf Zutatstoggle (Checkbox geändert) ---
+    # Zweck: beim An-/Abhaken einer Zutat wird das Modell aktualisiert
+    # Name: on_ingredient_toggled
+    def on_ingredient_toggled(self, name: str, checked: bool):
+        self._set_available_many([(name, checked)])
+
+    # --- Verfügbarkeit mehrerer Zutaten setzen ---
+    # Zweck: aktualisiert den Index sofort, Speichern und Neuzeichnen erst gesammelt
+    # Name: _set_available_many
+    def _set_available_many(self, items):
+        names, recipes = self.core.set_available_many(items)
+        self._dirty_ingredients.update(names)
+        self._dirty_recipes.update(recipes)
+        self._schedule_flush()
+
+    # --- Sammelaktionen: alle / keine / Auswahl umschalten ---
+    # Zweck: viele Zutaten mit einem Klick, ein einziges Neuzeichnen danach
+    # Name: mark_all_available
+    def mark_all_available(self):
+        self._set_available_many([(name, True) for name in self.ingredients])
+
+    def mark_none_available(self):
+        self._set_available_many([(name, False) for name in self.ingredients])
+
+    def toggle_selected_ingredients(self):
+        rows = self.ingredient_list.selectionModel().selectedRows()
+        names = [self.ingredient_model.name_at(idx.row()) for idx in rows]
+        self._set_available_many([(name, not self.ingredients[name]) for name in names])
+
+    # --- Sammelaktion: Einkaufsliste einfügen ---
+    # Zweck: markiert alle Zutaten einer eingefügten Liste (Zeilen oder Kommas)
+    #        als verfügbar; unbekannte Zutaten werden neu angelegt
+    # Name: paste_shopping_list
+    def paste_shopping_list(self):
+        clipboard = QtWidgets.QApplication.clipboard().text()
+        text, ok = QtWidgets.QInputDialog.getMultiLineText(
+            self, "Einkaufsliste", "Gekaufte Zutaten (eine pro Zeile oder durch Komma getrennt):", clipboard)
+        if not ok:
+            return
+        # Schreibvarianten derselben Zutat ("Eier", "eier ") nur einmal zählen
+        unique = {}
+        for z in re.split(r"[\n,;]", text):
+            if z.strip():
+                unique.setdefault(normalize_name(z), z.strip())
+        names = list(unique.values())
+        new = [name for name in names if name not in self.ingredients]
+        self.core.add_ingredients([(name, False) for name in new])
+        self.ingredient_model.insert_names([self.index.canonical(name) for name in new])
+        self._set_available_many([(name, True) for name in names])
+        self.statusBar().showMessage(
+            f"{len(names)} Zutaten als verfügbar markiert, davon {len(new)} neu angelegt.", 5000)
+
+    # --- Gesammelte Änderungen: Planen und Abarbeiten ---
+    # Zweck: ein Null-Intervall-Timer fasst alle Änderungen eines Event-Loop-Durchlaufs
+    #        zu einem Speichern und einem Neuzeichnen zusammen
+    # Name: _schedule_flush
+    def _schedule_flush(self):
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _mark_structure_changed(self):
+        self._dirty_structure = True
+        self._schedule_flush()
+
+    def _flush_pending(self):
+        self.core.flush()
+        ingredients, recipes = self._dirty_ingredients, self._dirty_recipes
+        structural = self._dirty_structure
+        self._dirty_ingredients = set()
+        self._dirty_recipes = set()
+        self._dirty_structure = False
+
+        if len(ingredients) > self.BULK_REFRESH:
+            self.ingredient_model.all_changed()
+        else:
+            for name in ingredients:
+                self.ingredient_model.name_changed(name)
+        # Fortschrittsbalken aller betroffenen Rezepte neu zeichnen lassen
+        if len(recipes) > self.BULK_REFRESH:
+            self.recipe_model.all_changed()
+        else:
+            for recipe in recipes:
+                self.recipe_model.name_changed(recipe)
+        # Detailanzeige nur anfassen, wenn das angezeigte Rezept betroffen ist
+        if self._current_recipe is not None:
+            if ingredients:
+                self.recipe_ingredients_model.all_changed()
+            if self._current_recipe in recipes:
+                self._update_recipe_progress(self._current_recipe)
+        # Einkaufsplaner: der Kern hat ihn schon nachgeführt, hier nur anzeigen
+        if structural or ingredients:
+            self._refresh_plan()
+
+    # --- Hilfsfunktion: Name des ausgewählten Rezepts ---
+    # Zweck: liefert den Rezeptnamen der aktuellen Auswahl oder None
+    # Name: _selected_recipe
+    def _selected_recipe(self):
+        rows = self.recipe_list.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.recipe_model.name_at(rows[0].row())
+
+    # --- Wenn ein Rezept ausgewählt wird: Detail-Anzeige füllen ---
+    # Zweck: zeigt Zutatenliste und Fortschritt des Rezepts
+    # Name: on_recipe_selected
+    def on_recipe_selected(self):
+        name = self._selected_recipe()
+        if name is None:
+            self._clear_recipe_details()
+            return
+        self._show_recipe_details(name)
+
+    # --- Detail-Anzeige leeren ---
+    # Zweck: setzt Label, Zutatenanzeige und Fortschrittsbalken zurück
+    # Name: _clear_recipe_details
+    def _clear_recipe_details(self):
+        self._current_recipe = None
+        self.current_recipe_label.setText("Kein Rezept ausgewählt")
+        self.recipe_ingredients_model.set_ingredients([])
+        self.recipe_progress.setValue(0)
+        self.recipe_progress.setFormat("")
+
+    # --- Anzeige aktualisieren für ein bestimmtes Rezept ---
+    # Zweck: füllt die Zutatenanzeige und setzt den Fortschrittsbalken farblich
+    # Name: _show_recipe_details
+    def _show_recipe_details(self, name: str):
+        self._current_recipe = name
+        self.current_recipe_label.setText(name)
+        self.recipe_ingredients_model.set_ingredients(self.recipes.get(name, ()))
+        self._update_recipe_progress(name)
+
+    # --- Fortschrittsbalken für ein Rezept setzen ---
+    # Zweck: Zähler kommen aus dem Index (O(1)), nur der Balken wird neu gesetzt
+    # Name: _update_recipe_progress
+    def _update_recipe_progress(self, name: str):
+        available, total = self.index.progress(name)
+        if not total:
+            self.recipe_progress.setValue(0)
+            self.recipe_progress.setFormat("Keine Zutaten definiert")
+            return
+        percent = (available / total) * 100
+        # Setze Fortschritt und Format
+        self.recipe_progress.setValue(int(percent))
+        self.recipe_progress.setFormat(f"{available}/{total} Zutaten verfügbar ({int(percent)}%)")
+        # Füllfarbe aus der Farbtabelle über die Palette setzen (kein Neu-Parsen)
+        palette = self.recipe_progress.palette()
+        palette.setColor(QtGui.QPalette.Highlight, PROGRESS_COLORS[int(percent)])
+        self.recipe_progress.setPalette(palette)
+
+    # --- Löschen: ausgewähltes Rezept entfernen ---
+    # Zweck: löscht markiertes Rezept aus Datenmodell
+    # Name: delete_selected_recipe
+    def delete_selected_recipe(self):
+        name = self._selected_recipe()
+        if name is None:
+            return
+        self.core.remove_recipe(name)
+        self.recipe_list.selectionModel().clearSelection()
+        self.recipe_model.remove_names([name])
+        self._clear_recipe_details()
+        self._mark_structure_changed()
+
+    # --- Löschen markierter Zutaten in der rechten Liste ---
+    # Zweck: entfernt Zutaten, die in ingredient_list markiert (ausgewählt) sind
+    # Name: delete_marked_ingredients
+    def delete_marked_ingredients(self):
+        # Hier: löschen derjenigen, die markiert/ausgewählt sind (we use selection to pick)
+        selected = self.ingredient_list.selectionModel().selectedRows()
+        if not selected:
+            QtWidgets.QMessageBox.information(self, "Hinweis", "Bitte Zutaten markieren (Auswahl), die gelöscht werden sollen.")
+            return
+        names = [self.ingredient_model.name_at(idx.row()) for idx in selected]
+        self._dirty_recipes.update(self.core.remove_ingredients(names))
+        self.ingredient_model.remove_names(names)
+        self._dirty_ingredients.update(names)
+        self._schedule_flush()
+
+    # --- Einkaufsplaner anzeigen ---
+    # Zweck: füllt die Vorschlagsliste neben der Zutatenanzeige
+    # Name: _refresh_plan
+    def _refresh_plan(self):
+        self.plan_list.clear()
+        if self.planner is None:
+            self.plan_summary_label.setText("NumPy ist nicht installiert – Einkaufsplaner deaktiviert.")
+            return
+        self.plan_summary_label.setText(
+            f"Kochbar: {self.planner.cookable_count()} von {len(self.recipes)} Rezepten")
+        for name, unlocked, cookable in self.planner.suggest(self.plan_k_spin.value()):
+            self.plan_list.addItem(f"{name} — +{unlocked} (dann {cookable} kochbar)")
+
+    # --- Exportfunktion (JSON im Hintergrund schreiben) ---
+    # Zweck: ermöglicht Export der Rezepte + Zutaten (einfacher Datensicherung),
+    #        ohne das Fenster während des Schreibens zu blockieren
+    # Name: export_json
+    def export_json(self):
+        fname, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Exportieren als JSON", "einkauf_export.json", "JSON-Datei (*.json)")
+        if not fname:
+            return
+        task = JsonExportTask(fname, list(self.recipes.items()), list(self.ingredients.items()),
+                              self.index.registry.names)
+        dialog = self._start_task(task, "Exportiere …")
+        task.signals.progress.connect(lambda done, total: self._task_progress(dialog, done, total))
+
+        def finished(count, cancelled):
+            self._end_task(task, dialog)
+            if not cancelled:
+                QtWidgets.QMessageBox.information(self, "Export", f"Export erfolgreich: {fname}")
+
+        task.signals.finished.connect(finished)
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    # --- Importfunktion (JSON im Hintergrund lesen) ---
+    # Zweck: liest einen Export blockweise ein und übernimmt jeden Block auf einmal
+    # Name: import_json
+    def import_json(self):
+        fname, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Importieren aus JSON", "", "JSON-Datei (*.json)")
+        if not fname:
+            return
+        task = JsonImportTask(fname)
+        dialog = self._start_task(task, "Importiere …")
+        task.signals.progress.connect(lambda done, total: self._task_progress(dialog, done, total))
+
+        def batch(section, items):
+            self._apply_import_batch(section, items)
+            task.batch_done()
+
+        def finished(count, cancelled):
+            self._end_task(task, dialog)
+            text = f"{count} Einträge übernommen."
+            if cancelled:
+                text = "Import abgebrochen, " + text
+            QtWidgets.QMessageBox.information(self, "Import", text)
+
+        task.signals.batch.connect(ui_trace.slot(batch))
+        task.signals.finished.connect(finished)
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    # --- Importfunktion (Rezeptverzeichnis im Prozess-Pool lesen) ---
+    # Zweck: liest alle Rezeptdateien eines Ordners und übernimmt sie blockweise
+    # Name: import_directory
+    def import_directory(self):
+        directory = QtWidgets.QFileDialog.getExistingDirectory(self, "Rezeptordner importieren (.txt, .csv, .json)")
+        if not directory:
+            return
+        task = BulkImportTask(directory)
+        dialog = self._start_task(task, "Importiere Rezepte …")
+        task.signals.progress.connect(lambda done, total: self._task_progress(dialog, done, total))
+        imported = 0
+
+        def batch(section, payload):
+            nonlocal imported
+            items, keys = payload
+            self._apply_recipe_batch(items, keys)
+            imported += len(items)
+            dialog.setLabelText(f"Importiere Rezepte … {imported}")
+            task.batch_done()
+
+        def finished(count, cancelled):
+            self._end_task(task, dialog)
+            text = f"{count} Rezepte übernommen."
+            if cancelled:
+                text = "Import abgebrochen, " + text
+            if task.errors:
+                shown = "\n".join(f"{os.path.basename(path)}: {msg}" for path, msg in task.errors[:10])
+                more = f"\n… und {len(task.errors) - 10} weitere" if len(task.errors) > 10 else ""
+                text += f"\n\n{len(task.errors)} Dateien übersprungen:\n{shown}{more}"
+            QtWidgets.QMessageBox.information(self, "Import", text)
+
+        task.signals.batch.connect(ui_trace.slot(batch))
+        task.signals.finished.connect(finished)
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    # --- Import: einen Block in Modell, Datenbank und Listen übernehmen ---
+    # Zweck: eine Transaktion und ein Listen-Update pro Block statt pro Eintrag
+    # Name: _apply_import_batch
+    def _apply_import_batch(self, section: str, items: list):
+        if section == "recipes":
+            self._apply_recipe_batch(items)
+        else:
+            changed = self.core.apply_import_batch(section, items)
+            self._dirty_recipes.update(changed)
+            names = [self.index.canonical(name) for name, _ in items]
+            self.ingredient_model.insert_names(names)
+            self._dirty_ingredients.update(names)
+            self._schedule_flush()
+
+    def _apply_recipe_batch(self, items: list, keys: list = None):
+        # Ersetzte Rezepte behalten ihre Zeile, ihr Fortschritt kann sich ändern
+        self._dirty_recipes.update(name for name, _ in items if name in self.recipes)
+        self.core.add_recipes(items, keys)
+        self.recipe_model.insert_names([name for name, _ in items])
+        if self._current_recipe in self.recipes:
+            self._select_recipe(self._current_recipe)
+            # Die Zeile war schon ausgewählt, selectionChanged kommt also nicht:
+            # ein ersetztes Rezept direkt neu anzeigen (wie in add_recipe)
+            if any(name == self._current_recipe for name, _ in items):
+                self._show_recipe_details(self._current_recipe)
+        self._mark_structure_changed()
+
+    # --- Rezept per Name auswählen ---
+    # Zweck: setzt die Auswahl in der Rezeptliste (z.B. nach einem Neuaufbau)
+    # Name: _select_recipe
+    def _select_recipe(self, name: str):
+        row = self.recipe_model.row_of(name)
+        if row >= 0:
+            self.recipe_list.setCurrentIndex(self.recipe_model.index(row, 0))
+
+    # --- Hintergrundaufgabe starten / beenden ---
+    # Zweck: Fortschrittsdialog mit Abbrechen-Knopf; Buttons währenddessen sperren
+    # Name: _start_task
+    def _start_task(self, task, label: str):
+        self.export_btn.setEnabled(False)
+        self.import_btn.setEnabled(False)
+        self.bulk_import_btn.setEnabled(False)
+        dialog = QtWidgets.QProgressDialog(label, "Abbrechen", 0, 100, self)
+        dialog.setWindowModality(QtCore.Qt.WindowModal)
+        dialog.setMinimumDuration(300)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.canceled.connect(task.cancel)
+        task.signals.failed.connect(lambda msg: self._task_failed(task, dialog, msg))
+        self._tasks.add(task)
+        return dialog
+
+    def _task_progress(self, dialog, done: int, total: int):
+        dialog.setValue(int(done * 100 / total) if total else 100)
+
+    def _end_task(self, task, dialog):
+        dialog.close()
+        self._tasks.discard(task)
+        self.export_btn.setEnabled(True)
+        self.import_btn.setEnabled(True)
+        self.bulk_import_btn.setEnabled(True)
+
+    def _task_failed(self, task, dialog, msg: str):
+        self._end_task(task, dialog)
+        QtWidgets.QMessageBox.critical(self, "Fehler", f"Vorgang fehlgeschlagen:\n{msg}")
+
+# --- Programmstart (Hauptschleife) ---
+# Zweck: startet die Qt-Anwendung und zeigt das Hauptfenster
+# Name: main
+def main():
+    app = QtWidgets.QApplication(sys.argv)
+    ui_trace.install_qt(app)  # nur mit UI_TRACE, vor dem Aufbau des Fensters
+    window = MainWindow()
+    window.resize(1000, 640)
+    window.show()
+    sys.exit(app.exec())
+
+# Gestartet wird über einkauf2.py (siehe dort).
+if __name__ == "__main__":
+    main()
\ No newline at end of file
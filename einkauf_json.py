@@ -0,0 +1,170 @@
+# --- Streaming-JSON für einkauf2 (ohne Qt) ---
+# Dieser Block schreibt und liest das Exportformat {"recipes": {...}, "ingredients": {...}}
+# stückweise, damit große Kataloge nie komplett als Dokument im Speicher liegen.
+# Name: einkauf_json
+import codecs
+import json
+
+# Anzahl Einträge pro Schreib-/Lese-Batch
+CHUNK_SIZE = 500
+# Bytes pro Lesevorgang beim Import
+READ_SIZE = 1 << 16
+
+
+# --- Abbruch-Signal ---
+# Zweck: wird ausgelöst, wenn der Aufrufer Export/Import abbricht
+# Name: Cancelled
+class Cancelled(Exception):
+    pass
+
+
+# --- Export: stückweise schreiben ---
+# Zweck: schreibt Rezepte und Zutaten in Blöcken von chunk_size Einträgen
+# Name: write_export
+def write_export(f, recipes, ingredients, progress=None, cancelled=None, chunk_size=CHUNK_SIZE,
+                 ingredient_names=None):
+    """
+    Input: f (Textdatei), recipes/ingredients als Liste von (name, wert)
+           progress(erledigt, gesamt) und cancelled() -> bool optional
+           ingredient_names: wenn gesetzt, sind Rezeptzutaten IDs in diese Liste
+    Output: Anzahl geschriebener Einträge
+    """
+    total = len(recipes) + len(ingredients)
+    done = 0
+    f.write("{\n")
+    for section, items, last in (("recipes", recipes, False), ("ingredients", ingredients, True)):
+        f.write(f'  {json.dumps(section)}: {{')
+        for start in range(0, len(items), chunk_size):
+            if cancelled is not None and cancelled():
+                raise Cancelled()
+            chunk = items[start:start + chunk_size]
+            if section == "recipes" and ingredient_names is not None:
+                chunk = [(k, [ingredient_names[i] for i in v]) for k, v in chunk]
+            f.write("," if start else "")
+            f.write(",".join(
+                f"\n    {json.dumps(k, ensure_ascii=False)}: {json.dumps(v, ensure_ascii=False)}"
+                for k, v in chunk))
+            done += len(chunk)
+            if progress is not None:
+                progress(done, total)
+        f.write("\n  }" + ("\n" if last else ",\n"))
+    f.write("}\n")
+    return done
+
+
+# --- Import: inkrementeller Leser ---
+# Zweck: liest die obersten Ebenen des Dokuments von Hand und dekodiert nur
+#        einzelne Einträge mit raw_decode; der Puffer wird laufend gekürzt
+# Name: JsonStreamReader
+class JsonStreamReader:
+    def __init__(self, f, read_size: int = READ_SIZE):
+        self._f = f  # Binärdatei
+        self._read_size = read_size
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        data = self._f.read(self._read_size)
+        self.bytes_read += len(data)
+        if not data:
+            self._eof = True
+            self._buf = self._buf[self._pos:] + self._utf8.decode(b"", final=True)
+        else:
+            self._buf = self._buf[self._pos:] + self._utf8.decode(data)
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        # Nächstes Nicht-Leerzeichen (ohne es zu verbrauchen), "" am Dateiende
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, ch: str):
+        found = self._peek()
+        if found != ch:
+            raise ValueError(f"JSON: '{ch}' erwartet, '{found or 'Dateiende'}' gefunden")
+        self._pos += 1
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Wert endet genau am Pufferende: könnte abgeschnitten sein (z.B. Zahl)
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def iter_object(self):
+        # Liefert (schlüssel, wert)-Paare eines Objekts; wert wird vom Aufrufer gelesen
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            yield key
+            sep = self._peek()
+            self._pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"JSON: ',' oder '}}' erwartet, '{sep or 'Dateiende'}' gefunden")
+
+    def read_value(self):
+        return self._value()
+
+    def peek(self) -> str:
+        # Erstes Zeichen des nächsten Werts ("{" Objekt, "[" Liste, ...), "" am Dateiende
+        return self._peek()
+
+
+# --- Import: Batches erzeugen ---
+# Zweck: liefert ("recipes", [...]) bzw. ("ingredients", [...]) in Blöcken
+# Name: iter_import
+def iter_import(f, chunk_size=CHUNK_SIZE, cancelled=None):
+    """
+    Input: f (Binärdatei im Exportformat)
+    Output: Generator von (abschnitt, [(name, wert), ...], gelesene Bytes)
+    ValueError bei kaputtem JSON oder Rezepten, deren Zutaten keine Liste von Texten sind
+    """
+    reader = JsonStreamReader(f)
+    for section in reader.iter_object():
+        if section not in ("recipes", "ingredients"):
+            # Unbekannte Abschnitte überspringen
+            reader.read_value()
+            continue
+        batch = []
+        for name in reader.iter_object():
+            value = reader.read_value()
+            if section == "recipes":
+                # Ein Text statt Liste ergäbe sonst einzelne Buchstaben als Zutaten
+                if not isinstance(value, list) or not all(isinstance(z, str) for z in value):
+                    raise ValueError(f"JSON: Zutaten von {name!r} sind keine Liste von Texten")
+            else:
+                value = bool(value)
+            batch.append((name, value))
+            if len(batch) >= chunk_size:
+                if cancelled is not None and cancelled():
+                    raise Cancelled()
+                yield section, batch, reader.bytes_read
+                batch = []
+        if batch:
+            yield section, batch, reader.bytes_read
@@ -0,0 +1,146 @@
+# --- Zutatennamen für einkauf2 (ohne Qt) ---
+# Dieser Block macht aus frei eingegebenen Zutatennamen kanonische Schlüssel
+# ("Eier", "eier" und "Eier " sind dieselbe Zutat), vergibt dafür kleine
+# Ganzzahl-IDs und sucht über einen Trigramm-Index (Filtern, Tippfehler).
+# Name: einkauf_names
+import unicodedata
+
+
+# --- Hilfsfunktion: Namen normalisieren ---
+# Zweck: Unicode-NFKC, Groß-/Kleinschreibung (casefold, ß -> ss), Leerraum zusammenfassen
+# Name: normalize_name
+def normalize_name(name: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+
+# --- Hilfsfunktion: Zutatenliste parsen ---
+# Zweck: zerlegt eine Komma-getrennte Eingabe in getrimmte, nicht-leere Zutaten
+# Name: parse_ingredients
+def parse_ingredients(raw: str) -> list:
+    return [z.strip() for z in raw.split(",") if z.strip()]
+
+
+# --- Hilfsfunktion: Trigramme eines Schlüssels ---
+# Zweck: Trigramme mit Leerzeichen-Rand, damit Wortanfänge eigene Trigramme haben
+# Name: trigrams
+def trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# --- Hilfsfunktion: passt ein Schlüssel zur Suchanfrage? ---
+# Zweck: dieselbe Regel wie TrigramIndex.search, für einzelne Namen
+#        (ab 3 Zeichen Teilstring, 2 Zeichen Wortanfang, 1 Zeichen Namensanfang)
+# Name: matches
+def matches(query_key: str, key: str) -> bool:
+    if len(query_key) >= 3:
+        return query_key in key
+    if len(query_key) == 2:
+        return any(w.startswith(query_key) for w in key.split())
+    return key.startswith(query_key)
+
+
+# --- Zutatenregister ---
+# Zweck: ein Eintrag pro kanonischem Schlüssel; IDs sind dicht (0, 1, 2, ...) und
+#        bleiben stabil, Rezepte speichern nur noch diese IDs
+# Name: IngredientRegistry
+class IngredientRegistry:
+    def __init__(self):
+        self._ids = {}    # {"schlüssel": id}
+        self.names = []   # id -> Anzeigename (erste Schreibweise)
+        self.keys = []    # id -> Schlüssel
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, name: str):
+        # ID eines Namens oder None, wenn er noch nie vorkam
+        return self._ids.get(normalize_name(name))
+
+    def intern(self, name: str, key: str = None) -> int:
+        # key: schon berechnetes normalize_name(name), z.B. aus dem Massenimport
+        if key is None:
+            key = normalize_name(name)
+        ident = self._ids.get(key)
+        if ident is None:
+            ident = self._ids[key] = len(self.names)
+            self.names.append(" ".join(name.split()))
+            self.keys.append(key)
+        return ident
+
+    def display(self, ident: int) -> str:
+        return self.names[ident]
+
+
+# --- Trigramm-Index ---
+# Zweck: Suche-beim-Tippen (Teilstring ab 3 Zeichen, Wortanfang darunter) und
+#        unscharfe Treffer (Jaccard-Ähnlichkeit der Trigramm-Mengen)
+# Name: TrigramIndex
+class TrigramIndex:
+    def __init__(self):
+        self._postings = {}  # {"tri": {id, ...}}
+        self._sizes = {}     # {id: Anzahl Trigramme}
+        self._keys = {}      # {id: schlüssel}
+
+    def add(self, ident: int, key: str):
+        if ident in self._keys:
+            return
+        grams = trigrams(key)
+        for g in grams:
+            self._postings.setdefault(g, set()).add(ident)
+        self._sizes[ident] = len(grams)
+        self._keys[ident] = key
+
+    def remove(self, ident: int):
+        key = self._keys.pop(ident, None)
+        if key is None:
+            return
+        del self._sizes[ident]
+        for g in trigrams(key):
+            ids = self._postings[g]
+            ids.discard(ident)
+            if not ids:
+                del self._postings[g]
+
+    def search(self, query: str) -> set:
+        """
+        Alle IDs, deren Schlüssel die Anfrage enthält.
+        Kurze Anfragen (1-2 Zeichen) treffen Wortanfänge.
+        """
+        q = normalize_name(query)
+        if not q:
+            return set(self._keys)
+        if len(q) < 3:
+            # Ein Zeichen: Anfang des Namens; zwei Zeichen: Anfang eines Wortes
+            gram = "  " + q if len(q) == 1 else " " + q
+            return set(self._postings.get(gram, ()))
+        grams = sorted((q[i:i + 3] for i in range(len(q) - 2)),
+                       key=lambda g: len(self._postings.get(g, ())))
+        candidates = self._postings.get(grams[0])
+        if not candidates:
+            return set()
+        candidates = set(candidates)
+        for g in grams[1:]:
+            candidates &= self._postings.get(g, set())
+            if not candidates:
+                return candidates
+        # Trigramme können in anderer Reihenfolge vorkommen: Teilstring prüfen
+        return {i for i in candidates if q in self._keys[i]}
+
+    def similar(self, name: str, threshold: float = 0.5, limit: int = 5) -> list:
+        """
+        Unscharfe Suche für Tippfehler.
+        Output: [(id, ähnlichkeit), ...] absteigend, nur ab threshold
+        """
+        grams = trigrams(normalize_name(name))
+        overlap = {}
+        for g in grams:
+            for i in self._postings.get(g, ()):
+                overlap[i] = overlap.get(i, 0) + 1
+        scored = []
+        for i, common in overlap.items():
+            score = common / (len(grams) + self._sizes[i] - common)
+            if score >= threshold:
+                scored.append((i, score))
+        scored.sort(key=lambda t: -t[1])
+        return scored[:limit]
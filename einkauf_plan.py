@@ -0,0 +1,145 @@
+# --- Einkaufsplaner für einkauf2 (NumPy, ohne Qt) ---
+# Dieser Block rechnet über alle Rezepte gleichzeitig: Fortschritt pro Rezept und
+# "welche k fehlenden Zutaten machen die meisten Rezepte kochbar".
+# Name: einkauf_plan
+try:
+    import numpy as np
+except ImportError:  # NumPy ist optional; ohne NumPy bleibt der Planer aus
+    np = None
+
+
+# --- Planer ---
+# Zweck: hält die Beziehung Rezepte x Zutaten als dünn besetzte Paar-Listen
+#        (ein Eintrag pro Rezept/Zutat-Paar) und die Verfügbarkeit als bool-Vektor
+# Name: Planner
+class Planner:
+    """
+    Aufbau: O(Paare), nur nach Strukturänderungen (Rezept/Zutat hinzu/weg).
+    Toggle: O(1), setzt nur ein Element im Verfügbarkeitsvektor.
+    Abfragen: vektorisiert über alle Paare, ohne Python-Schleife pro Rezept.
+    """
+    def __init__(self, index):
+        if np is None:
+            raise RuntimeError("NumPy ist nicht installiert")
+        self._index = index
+        self._dirty = True
+        self._version = 0  # steigt bei jeder Änderung; Schlüssel für den Ergebnis-Cache
+        self._cache = {}
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    # ---------- Pflege ----------
+    def invalidate(self):
+        # Rezepte oder Zutaten haben sich strukturell geändert
+        self._dirty = True
+        self._version += 1
+        self._cache.clear()
+
+    def set_available(self, name: str, available: bool):
+        if self._dirty:
+            return
+        j = self._index.ingredient_id(name)
+        if j is None or j >= len(self._avail):
+            return
+        self._avail[j] = available
+        self._version += 1
+        self._cache.clear()
+
+    def _build(self):
+        # Rezepte sind schon ID-Arrays: alles zusammenhängen und Paare vektorisiert zählen
+        recipe_names = list(self._index.recipes)
+        arrays = [self._index.recipes[name] for name in recipe_names]
+        lengths = np.fromiter((len(a) for a in arrays), dtype=np.int64, count=len(arrays))
+        ids = (np.concatenate([np.frombuffer(a, dtype=np.uint32) for a in arrays if len(a)])
+               if lengths.any() else np.zeros(0, dtype=np.uint32)).astype(np.int64)
+        rows = np.repeat(np.arange(len(recipe_names), dtype=np.int64), lengths)
+        width = max(len(self._index.registry), 1)
+        # Gleiche Zutat mehrfach im Rezept -> ein Paar mit Anzahl
+        pairs, counts = np.unique(rows * width + ids, return_counts=True)
+        self._recipe_names = recipe_names
+        self._ingredient_names = self._index.registry.names
+        self._pair_recipe = (pairs // width).astype(np.int32)
+        self._pair_ingredient = (pairs % width).astype(np.int32)
+        self._pair_count = counts.astype(np.int32)
+        self._totals = np.bincount(self._pair_recipe, weights=self._pair_count,
+                                   minlength=len(recipe_names))
+        # Kopie des Verfügbarkeits-Bytearrays (das Original muss wachsen können)
+        self._avail = np.frombuffer(bytes(self._index.avail), dtype=np.uint8).astype(bool)
+        self._dirty = False
+
+    def _ensure(self):
+        if self._dirty:
+            self._build()
+
+    # ---------- Abfragen ----------
+    def completion(self):
+        """
+        Output: (Rezeptnamen, Prozent-Array) für alle Rezepte in einem Durchgang
+        """
+        self._ensure()
+        key = ("completion", self._version)
+        if key not in self._cache:
+            have = np.bincount(self._pair_recipe,
+                               weights=self._pair_count * self._avail[self._pair_ingredient],
+                               minlength=len(self._recipe_names))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                percent = np.where(self._totals > 0, have * 100.0 / self._totals, 0.0)
+            self._cache[key] = percent
+        return self._recipe_names, self._cache[key]
+
+    def cookable_count(self) -> int:
+        # Rezepte mit mindestens einer Zutat, bei denen alles verfügbar ist
+        _, percent = self.completion()
+        return int(np.count_nonzero((percent >= 100.0) & (self._totals > 0)))
+
+    def suggest(self, k: int) -> list:
+        """
+        Greedy-Auswahl von bis zu k fehlenden Zutaten.
+        Jeder Schritt nimmt die Zutat, die die meisten Rezepte vollständig macht;
+        bei Gleichstand zählt, wie nahe sie die übrigen Rezepte an "kochbar" bringt.
+        Output: [(zutat, neu kochbar, kochbar gesamt), ...]
+        """
+        self._ensure()
+        key = ("suggest", self._version)
+        cached = self._cache.get(key)
+        if cached is not None:
+            # Längere oder bereits erschöpfte Vorschlagsliste wiederverwenden
+            result, exhausted = cached
+            if len(result) >= k or exhausted:
+                return result[:k]
+
+        n_recipes = len(self._recipe_names)
+        n_ingredients = len(self._ingredient_names)
+        # Nur fehlende Paare sind interessant; sie schrumpfen mit jedem Schritt
+        missing = ~self._avail[self._pair_ingredient]
+        rec = self._pair_recipe[missing]
+        ing = self._pair_ingredient[missing]
+        # Fehlende (verschiedene) Zutaten pro Rezept
+        remaining = np.bincount(rec, minlength=n_recipes)
+        cookable = self.cookable_count()
+        # Teilfortschritt wiegt zusammen nie so viel wie ein vollständiges Rezept
+        partial = 1.0 / (n_recipes + 1)
+
+        result = []
+        exhausted = False
+        for _ in range(k):
+            if rec.size == 0:
+                exhausted = True
+                break
+            m = remaining[rec]
+            weights = np.where(m == 1, 1.0, partial / m)
+            gain = np.bincount(ing, weights=weights, minlength=n_ingredients)
+            j = int(np.argmax(gain))
+            chosen = ing == j
+            touched = rec[chosen]
+            remaining[touched] -= 1
+            unlocked = int(np.count_nonzero(remaining[touched] == 0))
+            cookable += unlocked
+            result.append((self._ingredient_names[j], unlocked, cookable))
+            keep = ~chosen
+            rec = rec[keep]
+            ing = ing[keep]
+        self._cache[key] = (result, exhausted)
+        return result
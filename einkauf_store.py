@@ -0,0 +1,226 @@
+# --- SQLite-Speicher für einkauf2 ---
+# Dieser Block hält Rezepte und Zutaten dauerhaft in einer SQLite-Datenbank.
+# Jede Änderung schreibt nur die betroffenen Zeilen in einer Transaktion.
+# Name: einkauf_store
+import sqlite3
+
+from einkauf_names import normalize_name
+
+# Standard-Datenbankdatei (liegt wie inhalte.csv im Arbeitsverzeichnis)
+DB_FILE = "einkauf.db"
+
+# Schema-Version (PRAGMA user_version), damit spätere Änderungen migrieren können
+# 1: erste Fassung, 2: ingredient.key (kanonischer Name, siehe einkauf_names)
+SCHEMA_VERSION = 2
+
+# Höchstzahl Parameter pro IN-Liste (SQLite begrenzt die Parameter pro Anweisung)
+IN_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipe (
+    id   INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS ingredient (
+    id        INTEGER PRIMARY KEY,
+    name      TEXT NOT NULL,
+    key       TEXT NOT NULL UNIQUE,          -- normalize_name(name)
+    available INTEGER NOT NULL DEFAULT 0,
+    listed    INTEGER NOT NULL DEFAULT 0   -- 1 = steht in der Zutatenverwaltung
+);
+CREATE TABLE IF NOT EXISTS recipe_ingredient (
+    recipe_id     INTEGER NOT NULL REFERENCES recipe(id) ON DELETE CASCADE,
+    position      INTEGER NOT NULL,
+    ingredient_id INTEGER NOT NULL REFERENCES ingredient(id),
+    PRIMARY KEY (recipe_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS recipe_ingredient_by_ingredient
+    ON recipe_ingredient(ingredient_id);
+"""
+
+# --- Speicherklasse ---
+# Zweck: kapselt Verbindung, Schema und alle Schreib-/Lesezugriffe
+# Name: RecipeStore
+class RecipeStore:
+    """
+    Normalisierte Ablage: recipe, ingredient, recipe_ingredient.
+    WAL-Modus, damit Lesen und Schreiben sich nicht blockieren.
+    """
+    def __init__(self, path: str = DB_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self._migrate()
+
+    def _migrate(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            with self.conn:
+                self.conn.executescript(SCHEMA)
+                self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        elif version < 2:
+            self._migrate_v2()
+
+    def _migrate_v2(self):
+        # Zutaten nach kanonischem Schlüssel zusammenführen ("Eier"/"eier" -> eine Zeile)
+        self.conn.execute("PRAGMA foreign_keys=OFF")
+        with self.conn:
+            self.conn.execute("BEGIN")
+            keep = {}  # {schlüssel: [id, name, verfügbar, gelistet]}
+            moved = []
+            for ident, name, available, listed in self.conn.execute(
+                    "SELECT id, name, available, listed FROM ingredient ORDER BY id"):
+                key = normalize_name(name)
+                row = keep.get(key)
+                if row is None:
+                    keep[key] = [ident, name, available, listed]
+                else:
+                    row[2] = max(row[2], available)
+                    row[3] = max(row[3], listed)
+                    moved.append((row[0], ident))
+            self.conn.execute("""
+                CREATE TABLE ingredient_v2 (
+                    id        INTEGER PRIMARY KEY,
+                    name      TEXT NOT NULL,
+                    key       TEXT NOT NULL UNIQUE,
+                    available INTEGER NOT NULL DEFAULT 0,
+                    listed    INTEGER NOT NULL DEFAULT 0
+                )""")
+            self.conn.executemany(
+                "INSERT INTO ingredient_v2(id, name, key, available, listed) VALUES (?, ?, ?, ?, ?)",
+                ((ident, name, key, available, listed)
+                 for key, (ident, name, available, listed) in keep.items()))
+            self.conn.executemany(
+                "UPDATE recipe_ingredient SET ingredient_id = ? WHERE ingredient_id = ?", moved)
+            # Rezepte, die beide Schreibweisen enthielten, behalten nur die erste Stelle
+            self.conn.execute("""
+                DELETE FROM recipe_ingredient AS ri WHERE EXISTS (
+                    SELECT 1 FROM recipe_ingredient o
+                    WHERE o.recipe_id = ri.recipe_id AND o.ingredient_id = ri.ingredient_id
+                      AND o.position < ri.position)""")
+            self.conn.execute("DROP TABLE ingredient")
+            self.conn.execute("ALTER TABLE ingredient_v2 RENAME TO ingredient")
+            self.conn.execute("PRAGMA user_version=2")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+
+    def close(self):
+        self.conn.close()
+
+    # ---------- Laden ----------
+    def load(self):
+        """
+        Liest den kompletten Bestand mit zwei Abfragen.
+        Output: (recipes, ingredients) im Format von RecipeIndex
+        """
+        recipes = {}
+        rows = self.conn.execute("""
+            SELECT r.name, i.name
+            FROM recipe r
+            LEFT JOIN recipe_ingredient ri ON ri.recipe_id = r.id
+            LEFT JOIN ingredient i ON i.id = ri.ingredient_id
+            ORDER BY r.id, ri.position
+        """)
+        for recipe, ingredient in rows:
+            zutaten = recipes.setdefault(recipe, [])
+            if ingredient is not None:
+                zutaten.append(ingredient)
+        ingredients = {
+            name: bool(available)
+            for name, available in self.conn.execute(
+                "SELECT name, available FROM ingredient WHERE listed = 1")
+        }
+        return recipes, ingredients
+
+    # ---------- Rezepte ----------
+    def save_recipe(self, name: str, ingredients: list):
+        self.save_recipes([(name, ingredients)])
+
+    def save_recipes(self, items, keys=None):
+        """
+        Mehrere Rezepte in einer Transaktion (auch für Importe). Zutaten, Rezepte
+        und Zuordnungen gehen je Aufruf mit wenigen executemany in die Datenbank,
+        nicht mit mehreren Anweisungen pro Rezept.
+        Input: items [(name, zutaten), ...]; keys optional die schon berechneten
+               normalize_name der Zutaten, parallel zu items
+        """
+        recipes = {}  # {name: (zutaten, schlüssel)}; doppelte Namen: das letzte gilt
+        for k, (name, ingredients) in enumerate(items):
+            recipes[name] = (ingredients, keys[k] if keys is not None
+                             else [normalize_name(z) for z in ingredients])
+        if not recipes:
+            return
+        spellings = {}  # {schlüssel: erste Schreibweise}
+        for ingredients, ingredient_keys in recipes.values():
+            for z, key in zip(ingredients, ingredient_keys):
+                spellings.setdefault(key, z)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO ingredient(name, key) VALUES (?, ?)",
+                ((z, key) for key, z in spellings.items()))
+            ingredient_ids = dict(self._in("SELECT key, id FROM ingredient WHERE key IN ({})",
+                                           list(spellings)))
+            recipe_ids = dict(self._in("SELECT name, id FROM recipe WHERE name IN ({})", list(recipes)))
+            # Bestehende Rezepte werden ersetzt: alte Zuordnungen weg, Zutaten danach prüfen
+            old = [row[0] for row in self._in(
+                "SELECT ingredient_id FROM recipe_ingredient WHERE recipe_id IN ({})", list(recipe_ids.values()))]
+            list(self._in("DELETE FROM recipe_ingredient WHERE recipe_id IN ({})", list(recipe_ids.values())))
+            new = [name for name in recipes if name not in recipe_ids]
+            self.conn.executemany("INSERT INTO recipe(name) VALUES (?)", ((name,) for name in new))
+            recipe_ids.update(self._in("SELECT name, id FROM recipe WHERE name IN ({})", new))
+            self.conn.executemany(
+                "INSERT INTO recipe_ingredient(recipe_id, position, ingredient_id) VALUES (?, ?, ?)",
+                ((recipe_ids[name], pos, ingredient_ids[key])
+                 for name, (_, ingredient_keys) in recipes.items()
+                 for pos, key in enumerate(ingredient_keys)))
+            if old:
+                self._drop_orphans(old)
+
+    def _in(self, sql: str, values: list):
+        # Führt sql mit "IN ({})" stückweise über values aus und liefert alle Zeilen
+        for start in range(0, len(values), IN_CHUNK):
+            chunk = values[start:start + IN_CHUNK]
+            yield from self.conn.execute(sql.format(",".join("?" * len(chunk))), chunk)
+
+    def delete_recipe(self, name: str):
+        with self.conn:
+            candidates = [row[0] for row in self.conn.execute(
+                "SELECT ri.ingredient_id FROM recipe_ingredient ri "
+                "JOIN recipe r ON r.id = ri.recipe_id WHERE r.name = ?", (name,))]
+            self.conn.execute("DELETE FROM recipe WHERE name = ?", (name,))
+            self._drop_orphans(candidates)
+
+    # ---------- Zutaten ----------
+    def add_ingredients(self, items):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO ingredient(name, key, available, listed) VALUES (?, ?, ?, 1) "
+                "ON CONFLICT(key) DO UPDATE SET available = excluded.available, listed = 1",
+                ((name, normalize_name(name), int(available)) for name, available in items))
+
+    def set_available_many(self, items):
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE ingredient SET available = ? WHERE key = ?",
+                ((int(available), normalize_name(name)) for name, available in items))
+
+    def delete_ingredients(self, names):
+        # Zutaten, die noch in Rezepten stehen, bleiben als Zeile erhalten
+        with self.conn:
+            candidates = []
+            for name in names:
+                row = self.conn.execute(
+                    "UPDATE ingredient SET listed = 0, available = 0 WHERE key = ? RETURNING id",
+                    (normalize_name(name),)).fetchone()
+                if row:
+                    candidates.append(row[0])
+            self._drop_orphans(candidates)
+
+    def _drop_orphans(self, ingredient_ids):
+        # Nur die übergebenen Zutaten prüfen: nicht gelistet und ohne Rezeptbezug -> weg
+        self.conn.executemany("""
+            DELETE FROM ingredient
+            WHERE id = ? AND listed = 0
+              AND NOT EXISTS (SELECT 1 FROM recipe_ingredient ri WHERE ri.ingredient_id = ingredient.id)
+        """, ((i,) for i in set(ingredient_ids)))
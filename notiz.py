@@ -1,18 +1,131 @@
 import tkinter as tk
-from tkinter import ttk
-import csv
+from tkinter import ttk, filedialog, messagebox
 import os
 
-FILE = "inhalte.csv"
+from notiz_search import SearchIndex
+from notiz_store import NoteStore
+from notiz_watch import FileWatcher
+import ui_trace
+
+FILE = "inhalte.csv"  # nur noch Import/Export; gespeichert wird im Journal (notiz_store)
+AUTOSAVE_MS = 500     # Änderungen werden so lange gesammelt und dann gemeinsam geschrieben
+SYNC_MS = 500         # so oft wird nachgesehen, ob andere Instanzen etwas geändert haben
+
+
+class VirtualList(ttk.Frame):
+    """
+    Liste mit festem Vorrat an Zeilen: es gibt nur so viele Zeilen-Widgets wie
+    sichtbar sind; beim Blättern werden deren Texte neu gesetzt. Ein Wechsel der
+    Einträge kostet damit O(sichtbare Zeilen), nicht O(Einträge).
+    """
+    WHEEL_STEP = 3
+
+    def __init__(self, master, open_item, delete_item):
+        super().__init__(master)
+        self.open_item = open_item
+        self.delete_item = delete_item
+        self.items = []
+        self.top = 0           # Index des obersten sichtbaren Eintrags
+        self.rows = []         # [(frame, titel-button)], wiederverwendet
+        self.row_height = None
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        # Feste Wunschhöhe, die Zeilen bestimmen die Größe nicht mit (sonst
+        # würde jede neue Zeile ein neues <Configure> und damit neue Zeilen auslösen)
+        self.body = ttk.Frame(self, height=400)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.grid_propagate(False)
+        self.body.columnconfigure(0, weight=1)
+        self.body.bind("<Configure>", self._resize)
+        self._bind_wheel(self.body)
+
+    def set_items(self, items, keep_position=False):
+        self.items = items
+        if not keep_position:
+            self.top = 0
+        self._render()
+
+    # ---------- Zeilenvorrat ----------
+    def _make_row(self):
+        k = len(self.rows)
+        row = ttk.Frame(self.body)
+        btn = ttk.Button(row, command=lambda: self._activate(k, self.open_item))
+        btn.pack(side="left", fill="x", expand=True)
+        delete = ttk.Button(row, text="X", width=3, command=lambda: self._activate(k, self.delete_item))
+        delete.pack(side="right")
+        for w in (row, btn, delete):
+            self._bind_wheel(w)
+        self.rows.append((row, btn))
+        return row
+
+    def _resize(self, event):
+        if self.row_height is None:
+            row = self._make_row()
+            row.update_idletasks()
+            self.row_height = row.winfo_reqheight() + 4  # pady=2 oben und unten
+        count = max(1, event.height // self.row_height)
+        while len(self.rows) < count:
+            self._make_row()
+        while len(self.rows) > count:
+            self.rows.pop()[0].destroy()
+        self._render()
+
+    def _render(self):
+        visible = len(self.rows)
+        self.top = max(0, min(self.top, len(self.items) - visible))
+        for k, (row, btn) in enumerate(self.rows):
+            i = self.top + k
+            if i < len(self.items):
+                btn.configure(text=self.items[i].titel)
+                row.grid(row=k, column=0, sticky="ew", pady=2)
+            else:
+                row.grid_remove()
+        n = len(self.items)
+        if n:
+            self.scrollbar.set(self.top / n, min(1.0, (self.top + visible) / n))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _activate(self, k, action):
+        i = self.top + k
+        if i < len(self.items):
+            action(self.items[i])
+
+    # ---------- Blättern ----------
+    def _scroll(self, *args):
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.top += step * len(self.rows) if args[2] == "pages" else step
+        self._render()
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._wheel)   # Windows/macOS
+        widget.bind("<Button-4>", self._wheel)     # X11 hoch
+        widget.bind("<Button-5>", self._wheel)     # X11 runter
+
+    def _wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.top += -self.WHEEL_STEP if up else self.WHEEL_STEP
+        self._render()
+
 
 class InhaltsApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Buch-Inhaltsverzeichnisse")
         self.mode = "Neu"  # oder "Alt"
+        self.shown_query = ""
 
-        self.data = []
+        self.store = NoteStore(index=SearchIndex(), interval=AUTOSAVE_MS / 1000)
+        self.error_shown = False
         self.load_data()
+        self.watcher = FileWatcher(self.store.journal_path, self.store.snapshot_path)
+        self.recheck = False
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.root.after(SYNC_MS, self.check_store)
 
         # --- Hauptmenü ---
         menu = ttk.Frame(root)
@@ -21,30 +134,103 @@ class InhaltsApp:
         ttk.Button(menu, text="Inhalt hinzufügen", command=self.add_view).pack(side="left", padx=5)
         ttk.Button(menu, text="Neu", command=lambda: self.list_view("Neu")).pack(side="left")
         ttk.Button(menu, text="Alt", command=lambda: self.list_view("Alt")).pack(side="left")
+        ttk.Button(menu, text="CSV exportieren", command=self.export_csv).pack(side="right")
+        ttk.Button(menu, text="CSV importieren", command=self.import_csv).pack(side="right", padx=5)
+
+        # --- Suche (beim Tippen, über den Volltextindex) ---
+        search = ttk.Frame(root)
+        search.pack(fill="x", pady=(2, 0))
+        ttk.Label(search, text="Suche").pack(side="left", padx=5)
+        self.query = tk.StringVar()
+        ttk.Entry(search, textvariable=self.query).pack(side="left", fill="x", expand=True)
+        self.hits_label = ttk.Label(search, width=14)
+        self.hits_label.pack(side="left", padx=5)
+        self.query.trace_add("write", lambda *_: self.search_changed())
 
         self.main = ttk.Frame(root)
         self.main.pack(fill="both", expand=True)
+        # Die Liste bleibt bestehen und wird nur aus- und wieder eingeblendet
+        self.list = VirtualList(self.main, self.edit_view, self.delete)
 
         self.list_view("Neu")
 
-    # ---------- CSV ----------
+    # ---------- Speicher ----------
     def load_data(self):
-        if os.path.exists(FILE):
-            with open(FILE, newline="", encoding="utf-8") as f:
-                self.data = list(csv.DictReader(f))
-        else:
-            self.data = []
+        # Erster Start mit Journal: vorhandene inhalte.csv einmalig übernehmen
+        migrate = not self.store.exists() and os.path.exists(FILE)
+        self.store.close()
+        self.store.open()
+        if migrate:
+            self.store.import_csv(FILE)
+            self.store.compact()
 
     def save_data(self):
-        with open(FILE, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["titel", "inhalt", "status"])
-            writer.writeheader()
-            writer.writerows(self.data)
+        # Jede Änderung steht schon im Journal; hier nur alles zu einem Snapshot verdichten
+        self.store.compact()
+
+    def check_store(self):
+        # Das Schreiben läuft im Hintergrund; Fehler von dort hier melden. Jeder
+        # Wiederholversuch setzt ein neues OSError, gemeldet wird aber nur einmal,
+        # bis wieder erfolgreich geschrieben wurde
+        error = self.store.write_error
+        if error is not None and not self.error_shown:
+            messagebox.showerror("Fehler", f"Speichern fehlgeschlagen, wird wiederholt: {error}")
+        self.error_shown = error is not None
+        # Änderungen anderer Instanzen übernehmen (nur die neuen Einträge). Nach
+        # einer Meldung einen Takt später nochmals, falls sync() gerade wegen
+        # eines eigenen Schreibvorgangs aufgeschoben hat
+        changed = self.watcher.changed()
+        if (changed or self.recheck) and self.store.sync():
+            self.refresh_list()
+        self.recheck = changed
+        self.root.after(SYNC_MS, self.check_store)
+
+    def current(self, item):
+        # Nach sync() kann der Eintrag in einer anderen Instanz gelöscht worden sein
+        rec = self.store.records.get(item.id)
+        if rec is None:
+            messagebox.showerror("Fehler", "Der Eintrag wurde inzwischen in einer anderen Instanz gelöscht.")
+            self.list_view(self.mode)
+        return rec
+
+    def close(self):
+        try:
+            self.store.close()
+        except OSError as e:
+            if not messagebox.askyesno(
+                    "Fehler", f"Nicht alle Änderungen konnten gespeichert werden: {e}\n\nTrotzdem beenden?"):
+                return
+        self.watcher.close()
+        self.root.destroy()
+
+    # ---------- CSV ----------
+    def import_csv(self):
+        path = filedialog.askopenfilename(filetypes=[("CSV", "*.csv")])
+        if not path:
+            return
+        try:
+            self.store.import_csv(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Fehler", f"Import fehlgeschlagen: {e}")
+            return
+        self.list_view(self.mode)
+
+    def export_csv(self):
+        path = filedialog.asksaveasfilename(defaultextension=".csv", initialfile=FILE,
+                                            filetypes=[("CSV", "*.csv")])
+        if not path:
+            return
+        try:
+            self.store.export_csv(path)
+        except OSError as e:
+            messagebox.showerror("Fehler", f"Export fehlgeschlagen: {e}")
 
     # ---------- Views ----------
     def clear(self):
+        self.list.pack_forget()
         for w in self.main.winfo_children():
-            w.destroy()
+            if w is not self.list:
+                w.destroy()
 
     def add_view(self):
         self.clear()
@@ -58,59 +244,65 @@ class InhaltsApp:
         inhalt.pack(fill="both", expand=True)
 
         def speichern():
-            self.data.append({
-                "titel": titel.get(),
-                "inhalt": inhalt.get("1.0", "end").strip(),
-                "status": "Neu"
-            })
-            self.save_data()
+            self.store.add(titel.get(), inhalt.get("1.0", "end").strip(), "Neu")
             self.list_view("Neu")
 
         ttk.Button(self.main, text="Speichern", command=speichern).pack(pady=5)
 
     def list_view(self, status):
+        query = self.query.get()
+        same = status == self.mode and query == self.shown_query
         self.mode = status
+        self.shown_query = query
         self.clear()
+        # Bei Rückkehr in dieselbe Ansicht die Scrollposition behalten
+        self.list.set_items(self.items(status, query), keep_position=same)
+        self.list.pack(fill="both", expand=True)
 
-        for item in self.data:
-            if item["status"] == status:
-                row = ttk.Frame(self.main)
-                row.pack(fill="x", pady=2)
+    def items(self, status, query):
+        if query.strip():
+            # Treffer in ID-Reihenfolge = Reihenfolge des Anlegens, wie im Bucket
+            bucket = self.store.buckets.get(status, {})
+            items = [bucket[i] for i in sorted(self.store.index.search(query)) if i in bucket]
+            self.hits_label.configure(text=f"{len(items)} Treffer")
+        else:
+            items = self.store.bucket(status)
+            self.hits_label.configure(text="")
+        return items
 
-                ttk.Button(
-                    row,
-                    text=item["titel"],
-                    command=lambda i=item: self.edit_view(i)
-                ).pack(side="left", fill="x", expand=True)
+    def search_changed(self):
+        # Nur die sichtbare Liste filtern; eine offene Bearbeitung bleibt stehen,
+        # die Suche gilt dann beim nächsten Anzeigen der Liste
+        if self.list.winfo_manager():
+            self.list_view(self.mode)
 
-                ttk.Button(
-                    row,
-                    text="X",
-                    width=3,
-                    command=lambda i=item: self.delete(i)
-                ).pack(side="right")
+    def refresh_list(self):
+        # Nur die sichtbaren Zeilen neu beschriften; eine offene Bearbeitung bleibt stehen
+        if self.list.winfo_manager():
+            self.list.set_items(self.items(self.mode, self.shown_query), keep_position=True)
 
     def edit_view(self, item):
         self.clear()
 
         titel = ttk.Entry(self.main)
-        titel.insert(0, item["titel"])
+        titel.insert(0, item.titel)
         titel.pack(fill="x")
 
         inhalt = tk.Text(self.main, height=15)
-        inhalt.insert("1.0", item["inhalt"])
+        inhalt.insert("1.0", self.store.body(item))  # Text erst jetzt aus der Datei lesen
         inhalt.pack(fill="both", expand=True)
 
         def speichern():
-            item["titel"] = titel.get()
-            item["inhalt"] = inhalt.get("1.0", "end").strip()
-            self.save_data()
-            self.list_view(item["status"])
+            rec = self.current(item)
+            if rec is not None:
+                self.store.edit(rec, titel.get(), inhalt.get("1.0", "end").strip())
+                self.list_view(rec.status)
 
         def verschieben():
-            item["status"] = "Alt" if item["status"] == "Neu" else "Neu"
-            self.save_data()
-            self.list_view(item["status"])
+            rec = self.current(item)
+            if rec is not None:
+                self.store.move(rec, "Alt" if rec.status == "Neu" else "Neu")
+                self.list_view(rec.status)
 
         btns = ttk.Frame(self.main)
         btns.pack(pady=5)
@@ -119,13 +311,15 @@ class InhaltsApp:
         ttk.Button(btns, text="Verschieben", command=verschieben).pack(side="left")
 
     def delete(self, item):
-        self.data.remove(item)
-        self.save_data()
-        self.list_view(self.mode)
+        rec = self.current(item)
+        if rec is not None:
+            self.store.delete(rec)
+            self.list_view(self.mode)
 
 
 if __name__ == "__main__":
     root = tk.Tk()
+    ui_trace.install_tk(root)  # nur mit UI_TRACE, vor dem Aufbau der Oberfläche
     root.geometry("600x500")
     InhaltsApp(root)
     root.mainloop()
@@ -0,0 +1,190 @@
+# --- Volltextsuche für notiz ---
+# Dieser Block hält einen invertierten Index über Titel und Inhalt: für jedes
+# Wort die IDs der Einträge, in denen es vorkommt. Wörter werden für deutsche
+# Texte gefaltet (Groß-/Kleinschreibung, ß -> ss, ä -> ae, ...), damit
+# "Müller", "MUELLER" und "mueller" dasselbe finden. Der Index wird bei jeder
+# Änderung nachgeführt und neben den Daten gespeichert (inhalte.index).
+# Name: notiz_search
+import bisect
+import json
+import os
+import re
+import unicodedata
+from array import array
+
+INDEX_FILE = "inhalte.index"
+INDEX_VERSION = 1
+
+_WORD = re.compile(r"\w+")
+
+
+# --- Hilfsfunktion: Text vereinheitlichen ---
+# Zweck: NFKC, casefold (ß -> ss), Umlaute als ae/oe/ue; "Müller" = "MUELLER"
+# Name: fold
+def fold(text: str) -> str:
+    # str.replace ist hier deutlich schneller als str.translate mit Tabelle
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return text.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue")
+
+
+# --- Hilfsfunktion: Text in Suchwörter zerlegen ---
+# Zweck: vereinheitlichter Text (fold), Wörter aus Buchstaben/Ziffern als Menge
+# Name: tokenize
+def tokenize(text: str) -> set:
+    return set(_WORD.findall(fold(text)))
+
+
+# --- Invertierter Index ---
+# Zweck: Suche beim Tippen; alle Wörter müssen vorkommen, das letzte darf
+#        unvollständig sein (Präfix)
+# Name: SearchIndex
+class SearchIndex:
+    """
+    Postings sind nach dem Laden kompakte array('I') und werden erst beim
+    ersten Zugriff (Suche oder Änderung) in Mengen umgewandelt.
+    seq ist der Stand des Speichers, zu dem der Index passt.
+    """
+    MIN_PREFIX = 2  # kürzere letzte Wörter nur exakt suchen
+
+    def __init__(self, path: str = INDEX_FILE):
+        self.path = path
+        self.seq = 0
+        self._postings = {}   # {wort: set(ids) | array('I')}
+        self._words = []      # sortiert, für Präfixsuche; kann gelöschte Wörter enthalten
+        self._new_words = []  # seit dem letzten Sortieren hinzugekommen
+
+    def clear(self):
+        self.seq = 0
+        self._postings = {}
+        self._words = []
+        self._new_words = []
+
+    def _sorted_words(self) -> list:
+        # Neue Wörter erst bei Bedarf einsortieren (Massenimport bleibt linear)
+        new = self._new_words
+        if not new:
+            return self._words
+        words = self._words
+        if len(new) <= 64:
+            for word in set(new):
+                i = bisect.bisect_left(words, word)
+                if i == len(words) or words[i] != word:
+                    words.insert(i, word)
+        else:
+            self._words = sorted(w for w in set(words).union(new) if w in self._postings)
+        self._new_words = []
+        return self._words
+
+    def _ids(self, word: str) -> set:
+        ids = self._postings.get(word)
+        if ids is None:
+            return set()
+        if not isinstance(ids, set):
+            ids = self._postings[word] = set(ids)
+        return ids
+
+    # ---------- Änderungen ----------
+    def add(self, ident: int, *texts: str):
+        postings = self._postings
+        for word in tokenize(" ".join(texts)):
+            ids = postings.get(word)
+            if ids is None:
+                postings[word] = {ident}
+                self._new_words.append(word)
+            elif isinstance(ids, set):
+                ids.add(ident)
+            else:
+                self._ids(word).add(ident)
+
+    def remove(self, ident: int, *texts: str):
+        # Die Wörter kommen aus dem alten Text; pro Eintrag wird nichts gemerkt
+        for word in tokenize(" ".join(texts)):
+            if word not in self._postings:
+                continue
+            ids = self._ids(word)
+            ids.discard(ident)
+            if not ids:
+                del self._postings[word]  # bleibt in _words, wird dort übersprungen
+
+    # ---------- Suche ----------
+    def _prefix_ids(self, prefix: str) -> set:
+        words = self._sorted_words()
+        i = bisect.bisect_left(words, prefix)
+        hits = set()
+        while i < len(words) and words[i].startswith(prefix):
+            hits |= self._ids(words[i])  # gelöschte Wörter liefern eine leere Menge
+            i += 1
+        return hits
+
+    def search(self, query: str) -> set:
+        """
+        Output: IDs der Einträge, die alle Wörter der Anfrage enthalten
+        (leere Menge bei leerer Anfrage)
+        """
+        words = _WORD.findall(fold(query))
+        if not words:
+            return set()
+        # Ein Leerzeichen am Ende heißt: letztes Wort ist fertig getippt
+        prefix = None
+        if not query[-1:].isspace() and len(words[-1]) >= self.MIN_PREFIX:
+            prefix = words.pop()
+        sets = [self._ids(w) for w in set(words)]
+        sets.sort(key=len)
+        if sets and not sets[0]:
+            return set()
+        if prefix is not None:
+            sets.append(self._prefix_ids(prefix))
+        result = set(sets[0])
+        for ids in sets[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    # ---------- Speichern / Laden ----------
+    def save(self, seq: int):
+        """
+        Schreibt den Index atomar: Kopfzeile, danach pro Wort eine Zeile
+        "wort anzahl" gefolgt von den IDs als rohe 32-Bit-Zahlen.
+        """
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            words = [w for w in self._sorted_words() if w in self._postings]
+            f.write(json.dumps({"version": INDEX_VERSION, "seq": seq, "words": len(words)}).encode() + b"\n")
+            for word in words:
+                ids = self._postings[word]
+                if isinstance(ids, set):
+                    ids = array("I", sorted(ids))
+                f.write(f"{word} {len(ids)}\n".encode("utf-8"))
+                f.write(ids.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.seq = seq
+
+    def load(self) -> bool:
+        """
+        Output: True, wenn ein passender Index gelesen wurde
+        """
+        self.clear()
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                header = json.loads(f.readline())
+                if header.get("version") != INDEX_VERSION:
+                    return False
+                postings = {}
+                words = []
+                for _ in range(header["words"]):
+                    word, count = f.readline().decode("utf-8").rsplit(" ", 1)
+                    ids = array("I")
+                    ids.frombytes(f.read(int(count) * ids.itemsize))
+                    postings[word] = ids
+                    words.append(word)
+        except (OSError, ValueError, KeyError):
+            return False
+        self._postings = postings
+        self._words = words
+        self.seq = header["seq"]
+        return True
@@ -0,0 +1,1044 @@
+# --- Journal-Speicher für notiz ---
+# Dieser Block hält die Inhaltsverzeichnisse als Protokoll: jede Änderung
+# (add/edit/move/delete) wird als eine JSON-Zeile an inhalte.journal angehängt,
+# statt die ganze Sammlung neu zu schreiben. Ein Hintergrund-Thread verdichtet
+# das Protokoll gelegentlich zu inhalte.snapshot; beim Start wird der Snapshot
+# gelesen und das Protokoll dahinter nachgespielt. CSV bleibt Import-/Exportformat.
+#
+# Die Texte (inhalt) stehen in beiden Dateien als rohe Bytes hinter den
+# JSON-Zeilen. Beim Start wird nur der kompakte Index (Titel, Status, Lage des
+# Textes) gelesen; der Text selbst kommt erst beim Öffnen eines Eintrags aus
+# einer per mmap eingeblendeten Datei (mit kleinem LRU-Cache).
+#
+# Mehrere Instanzen dürfen gleichzeitig mit denselben Dateien arbeiten: wer
+# schreibt oder verdichtet, hält eine Dateisperre (flock auf inhalte.journal.lock)
+# und hängt nur an, wenn er das Protokoll bis zum Ende kennt. Was andere
+# angehängt haben, übernimmt sync() stückweise ab der zuletzt gelesenen Stelle.
+# Name: notiz_store
+import csv
+import json
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import fcntl
+except ImportError:  # kein flock (Windows): dann ohne Sperre, wie bisher eine Instanz
+    fcntl = None
+
+# Standarddateien (liegen wie inhalte.csv im Arbeitsverzeichnis)
+JOURNAL_FILE = "inhalte.journal"
+SNAPSHOT_FILE = "inhalte.snapshot"
+CSV_FIELDS = ["titel", "inhalt", "status"]
+
+# Format-Version der Snapshot-Kopfzeile
+# 1: ein JSON-Objekt pro Eintrag inklusive inhalt
+# 2: Index-Zeilen [id, titel, status, offset, länge], danach der Textbereich
+SNAPSHOT_VERSION = 2
+
+# Verdichten, sobald das Protokoll größer als der Snapshot ist (mindestens 1 MiB):
+# so bleibt der Schreibaufwand pro Änderung im Mittel proportional zur Änderung
+COMPACT_MIN_BYTES = 1 << 20
+
+# Anzahl zuletzt geöffneter Texte, die dekodiert im Speicher bleiben
+BODY_CACHE_SIZE = 32
+
+# Sekunden, die der Schreib-Thread nach einer Änderung auf weitere wartet,
+# bevor er alles mit einem write() und einem fsync() schreibt (auch: wie lange er
+# wartet, bis fremde Einträge übernommen sind, bevor er es erneut versucht)
+WRITE_INTERVAL = 0.5
+# Sekunden bis zum nächsten Versuch nach einem Schreibfehler
+RETRY_INTERVAL = 2.0
+# Sekunden bis zum nächsten automatischen Verdichten nach einem Fehler (ein
+# Versuch kann den ganzen Snapshot schreiben, deshalb seltener als beim Anhängen)
+COMPACT_RETRY_INTERVAL = 60.0
+
+
+# --- Hilfsfunktion: Datei atomar ersetzen ---
+# Zweck: erst vollständig in .tmp schreiben und fsyncen, dann umbenennen;
+#        ein Absturz lässt entweder die alte oder die neue Datei zurück
+# Name: _replace_atomic
+def _replace_atomic(path: str, write, binary: bool = False):
+    tmp = path + ".tmp"
+    with (open(tmp, "wb") if binary else open(tmp, "w", encoding="utf-8", newline="")) as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path)
+
+
+def _fsync_dir(path: str):
+    # Umbenennen ist erst nach fsync des Verzeichnisses dauerhaft (nicht überall möglich)
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# --- Hilfsfunktion: Protokollbytes zerlegen ---
+# Zweck: vollständige Einträge aus einem Stück Protokoll lesen (Übernehmen
+#        fremder Einträge); ein unvollständiger Rest wird nicht angefasst
+# Name: _scan
+def _scan(data: bytes, base: int, segment) -> tuple:
+    """
+    base: Lage von data in der Datei, damit "body" auf das Segment zeigt
+    Output: (Liste der Einträge, Anzahl der verbrauchten Bytes)
+    """
+    entries = []
+    pos = 0
+    while True:
+        nl = data.find(b"\n", pos)
+        if nl < 0:
+            break
+        try:
+            entry = json.loads(data[pos:nl])
+        except ValueError:
+            break
+        end = nl + 1
+        length = entry.get("len")
+        if length is not None:
+            if data[end + length:end + length + 1] != b"\n":
+                break
+            entry["body"] = (segment, base + end, length)
+            end += length + 1
+        elif "inhalt" in entry:
+            entry["body"] = InlineText.ref(entry["inhalt"])
+        entries.append(entry)
+        pos = end
+    return entries, pos
+
+
+def _encode(batch: list, offset: int, seq: int) -> tuple:
+    """
+    Macht aus wartenden Einträgen Protokollbytes ab Lage offset; die Texte
+    folgen als rohe Bytes hinter ihrer Zeile.
+    Output: (bytes, [(id, InlineText, lage des textes)], letzte seq)
+    """
+    chunks = []
+    placed = []
+    for entry, inline in batch:
+        seq += 1
+        entry["seq"] = seq
+        if inline is None:
+            line = _dumps(entry) + b"\n"
+            chunks.append(line)
+            offset += len(line)
+            continue
+        data = inline.text.encode("utf-8")
+        entry["len"] = len(data)
+        line = _dumps(entry) + b"\n"
+        chunks.extend((line, data, b"\n"))
+        placed.append((entry["id"], inline, offset + len(line)))
+        offset += len(line) + len(data) + 1
+    return b"".join(chunks), placed, seq
+
+
+# --- Hilfsfunktion: Dateisperre ---
+# Zweck: exklusive Sperre über alle Instanzen; freigegeben wird durch Schließen
+#        des zurückgegebenen fd (release)
+# Name: _acquire
+def _acquire(path: str, blocking: bool = True):
+    """
+    Output: fd der gesperrten Datei, oder None wenn blocking=False und die
+            Sperre gerade belegt ist
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is None:
+        return fd
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    except OSError:
+        os.close(fd)
+        raise
+    return fd
+
+
+def _release(fd):
+    if fd is not None:
+        os.close(fd)
+
+
+# --- Hilfsfunktion: gleiche Quelle? ---
+# Zweck: der Verdichtungs-Thread öffnet Snapshot und Protokoll selbst; seine
+#        Segmente zeigen trotzdem auf dieselben Dateien wie die der Einträge
+# Name: _same_source
+def _same_source(a, b) -> bool:
+    # Beide Segmente halten ihre Datei offen, eine Inode-Nummer kann also nicht
+    # inzwischen an eine andere Datei vergeben sein
+    if a is b:
+        return True
+    if isinstance(a, Segment) and isinstance(b, Segment):
+        return a.ino == b.ino
+    return isinstance(a, InlineText) and isinstance(b, InlineText) and a.text == b.text
+
+
+# --- Eintrag ---
+# Zweck: kompakter Datensatz statt dict pro Zeile; der Text steht nicht im
+#        Speicher, nur seine Lage (Segment, Offset, Länge in Bytes)
+# Name: Note
+class Note:
+    __slots__ = ("id", "titel", "status", "segment", "offset", "length")
+
+    def __init__(self, ident: int, titel: str, status: str, segment, offset: int, length: int):
+        self.id = ident
+        self.titel = titel
+        self.status = status
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+
+
+# --- Eingeblendete Datei ---
+# Zweck: liest Texte über mmap; die Einblendung wächst mit der Datei (Protokoll)
+#        und bleibt auch nach Umbenennen oder Löschen der Datei gültig
+# Name: Segment
+class Segment:
+    """
+    Die Datei wird sofort geöffnet: eine andere Instanz kann sie jederzeit
+    umbenennen oder ersetzen, gelesen wird trotzdem die Datei von jetzt.
+    ino erkennt, ob unter path inzwischen eine andere Datei liegt.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self.ino = os.fstat(self._file.fileno()).st_ino
+        self._map = None
+        self._lock = threading.Lock()  # Verdichtungs- und Schreib-Thread greifen mit zu
+
+    def size(self) -> int:
+        return os.fstat(self._file.fileno()).st_size
+
+    def read_bytes(self, offset: int, length: int) -> bytes:
+        if length == 0:
+            return b""
+        with self._lock:
+            if self._map is None or offset + length > len(self._map):
+                if self._map is not None:
+                    self._map.close()
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._map[offset:offset + length]
+
+    def read(self, offset: int, length: int) -> str:
+        return self.read_bytes(offset, length).decode("utf-8")
+
+
+# --- Text im Speicher ---
+# Zweck: Texte aus Format 1 (ohne Datei dahinter) und noch nicht geschriebene
+#        Texte wie ein Segment lesen
+# Name: InlineText
+class InlineText:
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def read(self, offset: int, length: int) -> str:
+        return self.text
+
+    def read_bytes(self, offset: int, length: int) -> bytes:
+        return self.text.encode("utf-8")
+
+    @staticmethod
+    def ref(text: str):
+        return InlineText(text), 0, len(text.encode("utf-8"))
+
+
+# --- Speicherklasse ---
+# Zweck: Einträge mit stabilen IDs, Anhängen pro Änderung, Verdichten im Hintergrund
+# Name: NoteStore
+class NoteStore:
+    """
+    Einträge sind Note-Objekte mit stabiler ID; records hält sie nach ID,
+    buckets zusätzlich nach Status (je ein dict, Einfügen/Entfernen in O(1)).
+    Den Text liefert body(eintrag). Die Oberfläche meldet Änderungen über
+    add/edit/move/delete, die jeweils genau einen Protokolleintrag schreiben.
+    Geschrieben wird im Hintergrund: Änderungen sammeln sich höchstens
+    interval Sekunden und gehen dann mit einem write() ins Protokoll;
+    fsync=True macht jeden solchen Block dauerhaft, fsync=False überlässt das
+    dem Betriebssystem. Schreibfehler stehen in write_error (der Block bleibt
+    erhalten und wird erneut versucht); close() schreibt alles Ausstehende.
+    Laufnummer (seq) und Lage im Protokoll bekommt ein Eintrag erst beim
+    Schreiben unter der Dateisperre; bis dahin liegt sein Text im Speicher.
+    Haben andere Instanzen angehängt, wartet der Schreib-Thread, bis sync()
+    deren Einträge übernommen hat (die Oberfläche ruft sync() regelmäßig).
+    Ein optionaler Suchindex (notiz_search.SearchIndex) wird bei jeder Änderung
+    nachgeführt und beim Schließen gespeichert.
+    """
+    def __init__(self, journal: str = JOURNAL_FILE, snapshot: str = SNAPSHOT_FILE, fsync: bool = True,
+                 index=None, interval: float = WRITE_INTERVAL):
+        self.journal_path = journal
+        self.snapshot_path = snapshot
+        self.fsync = fsync
+        self.interval = interval
+        self.index = index
+        self.records = {}      # {id: Note}, Einfügereihenfolge = Reihenfolge des Anlegens
+        self.buckets = {}      # {status: {id: Note}}
+        self._unsorted = set() # Status, in deren Bucket seit dem letzten Lesen verschoben wurde
+        self.next_id = 1
+        self.seq = 0           # laufende Nummer des letzten Protokolleintrags
+        self._fd = None        # gehört dem Schreib-Thread
+        self._journal = None   # Segment des aktuellen Protokolls
+        self._journal_end = 0  # bis hier ist das Protokoll bekannt (eigene und fremde Einträge)
+        self._snapshot_bytes = 0
+        self._cache = OrderedDict()  # {id: text}, zuletzt benutzt am Ende
+        self._lock = threading.Lock()
+        # Schreib-Thread: _pending sind [(eintrag, InlineText oder None)], die
+        # noch nicht in der Datei stehen; _behind heißt, im Protokoll stehen
+        # fremde Einträge, die erst sync() übernehmen muss
+        self._wake = threading.Condition(self._lock)
+        self._pending = []
+        self._writing = False
+        self._behind = False
+        self._flush_requested = False
+        self._closing = False
+        self._attempts = 0
+        self._writer = None
+        self.write_error = None  # letzter Schreibfehler (None nach erfolgreichem Schreiben)
+        self._compactor = None
+        self._compacted = None  # Ergebnis des Hintergrund-Threads, noch nicht übernommen
+        self.compact_error = None  # letzter Fehler beim Verdichten im Hintergrund
+        self._compact_retry = 0.0  # time.monotonic(), ab der wieder automatisch verdichtet wird
+
+    # ---------- Öffnen / Nachspielen ----------
+    def exists(self) -> bool:
+        return any(os.path.exists(p) for p in
+                   (self.snapshot_path, self.journal_path, self._rotated_path))
+
+    @property
+    def _rotated_path(self) -> str:
+        # Protokollteil, der gerade verdichtet wird (oder bei einem Absturz liegen blieb)
+        return self.journal_path + ".1"
+
+    @property
+    def _lock_path(self) -> str:
+        return self.journal_path + ".lock"
+
+    def open(self):
+        """
+        Liest den Index aus Snapshot und Protokoll(en) und öffnet das Protokoll
+        zum Anhängen. Texte werden dabei übersprungen, nicht gelesen.
+        Output: Liste der Einträge in Anzeigereihenfolge
+        """
+        self.records = {}
+        self.buckets = {}
+        self._unsorted = set()
+        self.next_id = 1
+        self.seq = 0
+        self._cache.clear()
+        # Unter der Sperre: niemand schreibt oder verdichtet, während gelesen wird
+        lock = _acquire(self._lock_path)
+        try:
+            self._load_snapshot()
+            self._replay(self._rotated_path)
+            self._fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._journal = Segment(self.journal_path)
+            self._journal_end = self._replay(self.journal_path, self._journal)
+            if os.path.exists(self._rotated_path):
+                # Eine Verdichtung wurde unterbrochen: jetzt nachholen. Das Protokoll
+                # bleibt stehen (andere Instanzen lesen darin weiter); seine Einträge
+                # sind dann im Snapshot und werden beim nächsten Start übersprungen
+                self._compacted = self._write_snapshot(self._header(), self._state())
+                self._adopt_snapshot()
+            if self.index is not None:
+                self._open_index()
+        finally:
+            _release(lock)
+        self._pending = []
+        self._writing = False
+        self._behind = False
+        self._closing = False
+        self.write_error = None
+        self._writer = threading.Thread(target=self._write_loop, name="notiz-writer", daemon=True)
+        self._writer.start()
+        return list(self.records.values())
+
+    def _open_index(self):
+        # Gespeicherter Index passt nur, wenn er denselben Stand hat (sonst z.B. nach
+        # einem Absturz): dann einmal aus allen Einträgen neu aufbauen
+        if self.index.load() and self.index.seq == self.seq:
+            return
+        self.index.clear()
+        for rec in self.records.values():
+            self.index.add(rec.id, rec.titel, rec.segment.read(rec.offset, rec.length))
+
+    # ---------- Einträge und Buckets ----------
+    def _insert(self, rec: Note):
+        self.records[rec.id] = rec
+        self.buckets.setdefault(rec.status, {})[rec.id] = rec
+
+    def _remove(self, rec: Note):
+        self.records.pop(rec.id, None)
+        self.buckets.get(rec.status, {}).pop(rec.id, None)
+        self._cache.pop(rec.id, None)
+
+    def _set_status(self, rec: Note, status: str):
+        self.buckets.get(rec.status, {}).pop(rec.id, None)
+        rec.status = status
+        self.buckets.setdefault(status, {})[rec.id] = rec
+        self._unsorted.add(status)
+
+    def bucket(self, status: str) -> list:
+        """
+        Einträge eines Status in der Reihenfolge des Anlegens (nach ID).
+        Verschobene Einträge landen zunächst am Ende und werden erst hier
+        einsortiert (fast sortierte Daten: praktisch linear).
+        """
+        bucket = self.buckets.get(status)
+        if not bucket:
+            return []
+        if status in self._unsorted:
+            self._unsorted.discard(status)
+            bucket = self.buckets[status] = dict(sorted(bucket.items()))
+        return list(bucket.values())
+
+    def _load_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return
+        with open(self.snapshot_path, "rb") as f:
+            header = json.loads(f.readline())
+            self.seq = header["seq"]
+            self.next_id = header["next_id"]
+            if header["version"] == 1:
+                for line in f:
+                    rec = json.loads(line)
+                    self._insert(Note(rec["id"], rec["titel"], rec["status"], *InlineText.ref(rec["inhalt"])))
+            else:
+                index = [json.loads(f.readline()) for _ in range(header["count"])]
+                base = f.tell()
+                segment = Segment(self.snapshot_path)
+                for ident, titel, status, offset, length in index:
+                    self._insert(Note(ident, titel, status, segment, base + offset, length))
+        self._snapshot_bytes = os.path.getsize(self.snapshot_path)
+
+    def _replay(self, path: str, segment: Segment = None) -> int:
+        """
+        Spielt alle Einträge nach dem Snapshot-Stand nach. Ein abgerissener
+        letzter Eintrag (Absturz mitten im Schreiben) wird abgeschnitten.
+        Output: gültige Länge der Datei in Bytes
+        """
+        if not os.path.exists(path):
+            return 0
+        size = os.path.getsize(path)
+        if segment is None:
+            segment = Segment(path)
+        good = 0
+        with open(path, "rb") as f:
+            while True:
+                raw = f.readline()
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    break
+                end = good + len(raw)
+                length = entry.get("len")
+                if length is not None:
+                    # Text folgt als rohe Bytes plus Zeilenende: nur überspringen
+                    if end + length + 1 > size:
+                        break
+                    f.seek(length, os.SEEK_CUR)
+                    if f.read(1) != b"\n":
+                        break
+                    entry["body"] = (segment, end, length)
+                    end += length + 1
+                elif "inhalt" in entry:
+                    entry["body"] = InlineText.ref(entry["inhalt"])  # Format 1: Text in der Zeile
+                good = end
+                if entry["seq"] > self.seq:
+                    self._apply(entry)
+                    self.seq = entry["seq"]
+        if good != size:
+            with open(path, "r+b") as f:
+                f.truncate(good)
+        return good
+
+    def _apply(self, entry: dict):
+        op = entry["op"]
+        ident = entry["id"]
+        if op == "add":
+            self._insert(Note(ident, entry["titel"], entry["status"], *entry["body"]))
+            self.next_id = max(self.next_id, ident + 1)
+            return
+        rec = self.records.get(ident)
+        if rec is None:
+            return
+        if op == "edit":
+            rec.titel = entry["titel"]
+            rec.segment, rec.offset, rec.length = entry["body"]
+            self._cache.pop(ident, None)
+        elif op == "move":
+            self._set_status(rec, entry["status"])
+        elif op == "delete":
+            self._remove(rec)
+
+    # ---------- Andere Instanzen ----------
+    def sync(self) -> int:
+        """
+        Übernimmt, was andere Instanzen seit dem letzten Aufruf angehängt haben;
+        gelesen werden nur die neuen Bytes am Ende des Protokolls. Hat eine
+        andere Instanz verdichtet (Protokoll umbenannt), wird das alte bis zum
+        Ende gelesen und im neuen weitergemacht.
+        Output: Anzahl übernommener Einträge (0: nichts Neues)
+        """
+        return self._sync(locked=False)
+
+    def _sync(self, locked: bool) -> int:
+        # locked: der Aufrufer hält die Dateisperre schon (compact)
+        merged = 0
+        while True:
+            with self._lock:
+                # Während eigene Bytes geschrieben werden, sähen sie hier fremd aus
+                if self._writing or self._fd is None:
+                    return merged
+                segment, start = self._journal, self._journal_end
+                try:
+                    st = os.stat(self.journal_path)
+                except FileNotFoundError:
+                    return merged  # gerade zwischen Umbenennen und Neuanlegen
+                rotated = st.st_ino != segment.ino
+                size = segment.size() if rotated else st.st_size
+                data = segment.read_bytes(start, size - start) if size > start else b""
+            entries, used = _scan(data, start, segment)
+            if entries:
+                self._merge(entries)
+                merged += len(entries)
+            if entries:
+                # Solange fremde Einträge offen sind, schreibt der Schreib-Thread
+                # nicht; _journal_end steht also noch bei start
+                with self._lock:
+                    self._journal_end = start + used
+                    self.seq = max(self.seq, entries[-1]["seq"])
+                    self._wake.notify_all()
+            if not rotated:
+                return merged
+            # Das alte Protokoll wächst nicht mehr (umbenannt unter der Sperre)
+            switched = self._switch_journal(segment, locked)
+            if switched is None:
+                return merged
+            merged += switched
+
+    def _switch_journal(self, old: Segment, locked: bool):
+        """
+        Wechselt nach einer fremden Verdichtung ins neue Protokoll. Lagen
+        dazwischen mehrere Verdichtungen, fehlt ein Protokoll (schon gelöscht):
+        dann wird aus dem Snapshot neu gelesen.
+        Output: Anzahl neu gelesener Einträge, None wenn die Verdichtung noch läuft
+        """
+        lock = None if locked else _acquire(self._lock_path, blocking=False)
+        if lock is None and not locked:
+            return None
+        try:
+            if os.path.exists(self._rotated_path):
+                # Verdichtung fehlgeschlagen: der Vorgänger des Protokolls liegt noch da
+                gap = os.stat(self._rotated_path).st_ino != old.ino
+            elif os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, "rb") as f:
+                    gap = json.loads(f.readline())["seq"] > self.seq
+            else:
+                gap = False
+            if gap:
+                self._reload()
+                return len(self.records)
+            with self._lock:
+                self._journal = Segment(self.journal_path)
+                self._journal_end = 0
+                self._wake.notify_all()
+            return 0
+        finally:
+            _release(lock)
+
+    def _reload(self):
+        # Wie open(), aber ohne den Schreib-Thread anzuhalten: noch nicht
+        # geschriebene eigene Änderungen werden danach wieder angewendet
+        with self._lock:
+            pending = list(self._pending)
+        own_next = self.next_id  # über allen eigenen wartenden IDs
+        self.records = {}
+        self.buckets = {}
+        self._unsorted = set()
+        self.next_id = 1
+        self._cache.clear()
+        with self._lock:
+            self.seq = 0
+        self._load_snapshot()
+        self._replay(self._rotated_path)
+        journal = Segment(self.journal_path)
+        end = self._replay(self.journal_path, journal)
+        with self._lock:
+            # IDs unterhalb von next_id hat schon jemand vergeben (evtl. wieder gelöscht)
+            taken = self.next_id
+            self.next_id = max(taken, own_next)
+            for entry, _ in pending:
+                if entry["op"] == "add" and entry["id"] < taken:
+                    old, new = entry["id"], self.next_id
+                    self.next_id += 1
+                    for other, _ in pending:
+                        if other["id"] == old:
+                            other["id"] = new
+            self._journal = journal
+            self._journal_end = end
+            self._wake.notify_all()
+        for entry, inline in pending:
+            entry = dict(entry)
+            if inline is not None:
+                entry["body"] = (inline, 0, len(inline.text.encode("utf-8")))
+            self._apply(entry)
+        if self.index is not None:
+            self.index.clear()
+            for rec in self.records.values():
+                self.index.add(rec.id, rec.titel, rec.segment.read(rec.offset, rec.length))
+
+    def _merge(self, entries: list):
+        # Fremde Einträge anwenden. Eigene, noch nicht geschriebene Änderungen
+        # kommen danach ins Protokoll und gewinnen deshalb auch im Speicher
+        adds = [e["id"] for e in entries if e["op"] == "add"]
+        if adds:
+            self.next_id = max(self.next_id, max(adds) + 1)
+        renumbered = []
+        with self._lock:
+            mine = {e["id"] for e, _ in self._pending if e["op"] == "add"}
+            for old in sorted(mine.intersection(adds)):
+                # Beide Instanzen haben dieselbe neue ID vergeben: unsere weicht aus
+                new = self.next_id
+                self.next_id += 1
+                for entry, _ in self._pending:
+                    if entry["id"] == old:
+                        entry["id"] = new
+                renumbered.append((old, new))
+            waiting = {(e["id"], e["op"]) for e, _ in self._pending}
+        for old, new in renumbered:
+            self._renumber(old, new)
+        index = self.index
+        for entry in entries:
+            ident, op = entry["id"], entry["op"]
+            if op in ("edit", "move") and (ident, op) in waiting:
+                continue
+            rec = self.records.get(ident)
+            if index is not None and rec is not None and op in ("edit", "delete"):
+                index.remove(ident, rec.titel, self.body(rec))
+            self._apply(entry)
+            rec = self.records.get(ident)
+            if index is not None and rec is not None and op in ("add", "edit"):
+                index.add(ident, rec.titel, rec.segment.read(rec.offset, rec.length))
+
+    def _renumber(self, old: int, new: int):
+        rec = self.records.get(old)
+        if rec is None:
+            return  # schon wieder gelöscht, nur die wartenden Einträge zählten
+        text = self.body(rec)
+        self._remove(rec)
+        if self.index is not None:
+            self.index.remove(old, rec.titel, text)
+            self.index.add(new, rec.titel, text)
+        rec.id = new
+        self._insert(rec)
+        self._remember(new, text)
+
+    # ---------- Texte ----------
+    def body(self, rec: Note) -> str:
+        # Text eines Eintrags; beim ersten Zugriff aus der eingeblendeten Datei
+        self._adopt_snapshot()
+        text = self._cache.get(rec.id)
+        if text is not None:
+            self._cache.move_to_end(rec.id)
+            return text
+        with self._lock:
+            # Der Schreib-Thread setzt die Lage um, sobald der Text in der Datei steht
+            segment, offset, length = rec.segment, rec.offset, rec.length
+        text = segment.read(offset, length)
+        self._remember(rec.id, text)
+        return text
+
+    def _remember(self, ident: int, text: str):
+        self._cache[ident] = text
+        self._cache.move_to_end(ident)
+        while len(self._cache) > BODY_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    # ---------- Anhängen ----------
+    def _append(self, entries: list) -> list:
+        """
+        Reiht die Einträge für den Schreib-Thread ein (kein Warten auf die
+        Platte). Aufrufer übernehmen die Änderung in records und rufen dann
+        _maybe_compact().
+        Output: pro Eintrag mit "text" dessen vorläufige Lage (im Speicher),
+                sonst None
+        """
+        self._adopt_snapshot()
+        queued = []
+        bodies = []
+        for entry in entries:
+            text = entry.pop("text", None)
+            body = None if text is None else InlineText.ref(text)
+            queued.append((entry, None if body is None else body[0]))
+            bodies.append(body)
+        with self._lock:
+            self._pending.extend(queued)
+            self._wake.notify_all()
+        return bodies
+
+    # ---------- Schreib-Thread ----------
+    def _write_loop(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._closing:
+                    self._wake.wait()
+                if not self._pending:
+                    return  # _closing und nichts mehr zu tun
+                # Weitere Änderungen einsammeln, außer es wird gedrängt
+                deadline = time.monotonic() + self.interval
+                while not (self._flush_requested or self._closing):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wake.wait(remaining)
+                self._attempts += 1
+            error, behind = self._write_batch()
+            with self._lock:
+                self._behind = behind
+                self.write_error = error
+                if not self._pending:
+                    self._flush_requested = False
+                self._wake.notify_all()
+                if error is not None:
+                    self._wake.wait(RETRY_INTERVAL)
+                elif behind:
+                    self._wake.wait(self.interval)  # bis sync() die fremden Einträge hat
+
+    def _write_batch(self):
+        """
+        Ein Schreibversuch unter der Dateisperre: nur wenn das Protokoll bis zum
+        Ende bekannt ist, bekommen die wartenden Einträge seq und Lage und gehen
+        mit einem write() (und fsync) hinaus. Alles danach (neues Ende, Lagen,
+        bei einem Fehler die Einträge zurück) steht fest, bevor die Sperre fällt.
+        Output: (Fehler, behind)
+        """
+        batch = None
+        error = None
+        lock = None
+        try:
+            lock = _acquire(self._lock_path)
+            st = os.stat(self.journal_path)
+            with self._lock:
+                segment, start = self._journal, self._journal_end
+            if st.st_ino != segment.ino:
+                return None, True  # eine andere Instanz hat verdichtet
+            if st.st_size > start:
+                tail, _ = _scan(segment.read_bytes(start, st.st_size - start), start, segment)
+                if tail:
+                    return None, True
+                # Nur ein abgerissener Rest (Absturz beim Schreiben): abschneiden
+                os.truncate(self.journal_path, start)
+            with self._lock:
+                if self._journal is not segment or self._journal_end != start:
+                    return None, True  # sync() kam dazwischen
+                batch, self._pending = self._pending, []
+                seq = self.seq
+                self._writing = True
+            data, placed, seq = _encode(batch, start, seq)
+            if os.fstat(self._fd).st_ino != st.st_ino:
+                # Protokoll wurde seit dem letzten Schreiben verdichtet: neue Datei öffnen
+                fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                os.close(self._fd)
+                self._fd = fd
+            written = 0
+            try:
+                view = memoryview(data)
+                while written < len(data):
+                    written += os.write(self._fd, view[written:])
+                if self.fsync:
+                    os.fsync(self._fd)
+            except OSError:
+                # Halbe Einträge wieder entfernen, sonst hielte man sie für fremd
+                if written:
+                    try:
+                        os.ftruncate(self._fd, start)
+                    except OSError:
+                        pass
+                raise
+        except OSError as e:
+            error = e
+        finally:
+            if batch is not None:
+                with self._lock:
+                    self._writing = False
+                    if error is not None:
+                        self._pending[:0] = batch  # beim nächsten Versuch zuerst
+                    else:
+                        self._journal_end = start + len(data)
+                        self.seq = seq
+                        for ident, inline, offset in placed:
+                            rec = self.records.get(ident)
+                            if rec is not None and rec.segment is inline:
+                                rec.segment, rec.offset = segment, offset
+            _release(lock)
+        return error, False
+
+    def flush(self):
+        """
+        Wartet, bis alles Ausstehende in der Datei steht. Wartet der
+        Schreib-Thread dabei auf fremde Einträge, werden sie hier übernommen.
+        Output: None oder der Schreibfehler des letzten Versuchs
+        """
+        with self._lock:
+            if self._writer is None:
+                return None
+            start = self._attempts
+            self._flush_requested = True
+            self._wake.notify_all()
+        while True:
+            with self._lock:
+                if not self._pending and not self._writing:
+                    return None
+                if self.write_error is not None and self._attempts > start:
+                    return self.write_error
+                if not self._writer.is_alive():
+                    return self.write_error
+                behind, self._behind = self._behind, False
+                if not behind:
+                    self._wake.wait()
+                    continue
+            self.sync()
+
+    def add(self, titel: str, inhalt: str, status: str = "Neu") -> Note:
+        return self.add_many([(titel, inhalt, status)])[0]
+
+    def add_many(self, items) -> list:
+        # Mehrere Einträge mit einem Schreibzugriff (CSV-Import)
+        items = list(items)
+        entries = []
+        for titel, inhalt, status in items:
+            entries.append({"op": "add", "id": self.next_id, "titel": titel, "status": status, "text": inhalt})
+            self.next_id += 1
+        if not entries:
+            return []
+        bodies = self._append(entries)
+        added = []
+        for entry, body, (_, inhalt, _) in zip(entries, bodies, items):
+            rec = Note(entry["id"], entry["titel"], entry["status"], *body)
+            self._insert(rec)
+            added.append(rec)
+            if self.index is not None:
+                self.index.add(rec.id, rec.titel, inhalt)
+        self._maybe_compact()
+        return added
+
+    def edit(self, rec: Note, titel: str, inhalt: str):
+        if self.index is not None:
+            self.index.remove(rec.id, rec.titel, self.body(rec))
+            self.index.add(rec.id, titel, inhalt)
+        body = self._append([{"op": "edit", "id": rec.id, "titel": titel, "text": inhalt}])[0]
+        rec.titel = titel
+        with self._lock:
+            rec.segment, rec.offset, rec.length = body
+        self._remember(rec.id, inhalt)
+        self._maybe_compact()
+
+    def move(self, rec: Note, status: str):
+        self._set_status(rec, status)
+        self._append([{"op": "move", "id": rec.id, "status": status}])
+        self._maybe_compact()
+
+    def delete(self, rec: Note):
+        if self.index is not None:
+            self.index.remove(rec.id, rec.titel, self.body(rec))
+        self._remove(rec)
+        self._append([{"op": "delete", "id": rec.id}])
+        self._maybe_compact()
+
+    # ---------- Verdichten ----------
+    def _maybe_compact(self):
+        # Nur den Hintergrund-Thread anstoßen; ob sich das Verdichten lohnt,
+        # entscheidet er unter der Sperre an den Dateigrößen.
+        # Nach einem Fehler erst nach COMPACT_RETRY_INTERVAL erneut versuchen
+        if time.monotonic() < self._compact_retry:
+            return
+        if self._journal_end > max(COMPACT_MIN_BYTES, self._snapshot_bytes):
+            self.compact(wait=False)
+
+    def compact(self, wait: bool = True):
+        """
+        Schreibt einen neuen Snapshot und verwirft das verdichtete Protokoll.
+        Die Arbeit macht ein Hintergrund-Thread wie eine andere Instanz: unter
+        der Dateisperre benennt er das Protokoll um und schreibt den Snapshot
+        aus dem, was in den Dateien steht. Das neue Protokoll übernimmt danach
+        sync(); bis dahin warten neue Änderungen im Schreib-Thread.
+        wait=True schreibt vorher alles Ausstehende (es soll im Snapshot stehen)
+        und kehrt erst zurück, wenn der Snapshot fertig ist; wait=False stößt das
+        Verdichten nur an und tut nichts, solange schon verdichtet wird.
+        """
+        with self._lock:
+            busy = self._compactor if self._compactor is not None and self._compactor.is_alive() else None
+        if busy is not None:
+            if not wait:
+                return
+            busy.join()
+        self._adopt_snapshot()
+        if wait:
+            error = self.flush()
+            if error is not None:
+                self.compact_error = error
+                self._compact_retry = time.monotonic() + COMPACT_RETRY_INTERVAL
+                return
+        self._compactor = threading.Thread(
+            target=self._compact_worker, args=(wait,), name="notiz-compact", daemon=True)
+        self._compactor.start()
+        if wait:
+            self._compactor.join()
+            self.sync()
+            self._adopt_snapshot()
+
+    def _header(self) -> dict:
+        return {"version": SNAPSHOT_VERSION, "seq": self.seq, "next_id": self.next_id,
+                "count": len(self.records)}
+
+    def _state(self) -> list:
+        # Kopie des Index für den Hintergrund-Thread; die Lagen selbst sind unveränderlich
+        return [(r.id, r.titel, r.status, r.segment, r.offset, r.length) for r in self.records.values()]
+
+    def _compact_worker(self, force: bool):
+        """
+        Läuft im Hintergrund-Thread und fasst keine Daten des Hauptthreads an:
+        Stand ist, was in Snapshot und Protokoll steht (auch fremde Einträge, die
+        sync() noch nicht übernommen hat). Ohne force wird nur verdichtet, wenn das
+        Protokoll auf der Platte noch größer als der Snapshot ist (sonst hat gerade
+        eine andere Instanz verdichtet).
+        """
+        lock = None
+        try:
+            lock = _acquire(self._lock_path)
+            if not os.path.exists(self._rotated_path):
+                # Sonst ist eine frühere Verdichtung fehlgeschlagen: erst deren Teil
+                size = os.path.getsize(self.journal_path)
+                snapshot = os.path.getsize(self.snapshot_path) if os.path.exists(self.snapshot_path) else 0
+                if not size or not (force or size > max(COMPACT_MIN_BYTES, snapshot)):
+                    return
+                os.replace(self.journal_path, self._rotated_path)
+                open(self.journal_path, "ab").close()
+            reader = NoteStore(self.journal_path, self.snapshot_path, fsync=self.fsync)
+            reader._load_snapshot()
+            reader._replay(self._rotated_path)
+            result = reader._write_snapshot(reader._header(), reader._state())
+            self._snapshot_bytes = reader._snapshot_bytes
+        except OSError as e:
+            # Der alte Protokollteil bleibt liegen und wird beim nächsten Versuch
+            # (oder Start) mit verdichtet
+            self.compact_error = e
+            self._compact_retry = time.monotonic() + COMPACT_RETRY_INTERVAL
+            return
+        finally:
+            _release(lock)
+        with self._lock:
+            self.compact_error = None
+            self._compacted = result
+
+    def _write_snapshot(self, header: dict, state: list):
+        """
+        Schreibt Kopf, Index und Textbereich in einen neuen Snapshot.
+        Output: (segment, [(id, altes segment, alter offset, neuer offset)])
+                zum Übernehmen im Hauptthread
+        """
+        head = _dumps(header) + b"\n"
+        index = []
+        position = 0
+        for ident, titel, status, _, _, length in state:
+            index.append(_dumps([ident, titel, status, position, length]) + b"\n")
+            position += length
+
+        def write(f):
+            f.write(head)
+            f.writelines(index)
+            for _, _, _, segment, offset, length in state:
+                f.write(segment.read_bytes(offset, length))
+        _replace_atomic(self.snapshot_path, write, binary=True)
+        # Erst nach dem Umbenennen ist der alte Protokollteil überflüssig
+        try:
+            os.remove(self._rotated_path)
+        except FileNotFoundError:
+            pass
+        self._snapshot_bytes = os.path.getsize(self.snapshot_path)
+
+        moved = []
+        position = len(head) + sum(map(len, index))
+        for ident, _, _, segment, offset, length in state:
+            moved.append((ident, segment, offset, position))
+            position += length
+        return Segment(self.snapshot_path), moved
+
+    def _adopt_snapshot(self):
+        # Einträge, deren Text sich seit dem Kopieren nicht geändert hat, lesen
+        # künftig aus dem neuen Snapshot; alte Segmente werden damit freigegeben
+        with self._lock:
+            result, self._compacted = self._compacted, None
+        if result is None:
+            return
+        segment, moved = result
+        records = self.records
+        with self._lock:
+            for ident, old_segment, old_offset, offset in moved:
+                rec = records.get(ident)
+                if rec is not None and rec.offset == old_offset and _same_source(rec.segment, old_segment):
+                    rec.segment = segment
+                    rec.offset = offset
+
+    def close(self):
+        """
+        Schreibt alles Ausstehende und beendet die Hintergrund-Threads.
+        Schlägt das Schreiben fehl, wird OSError ausgelöst und der Speicher
+        bleibt offen (nichts geht verloren, ein erneuter Versuch ist möglich).
+        """
+        error = self.flush()
+        if error is not None:
+            raise error
+        with self._lock:
+            self._closing = True
+            self._wake.notify_all()
+            writer, compactor = self._writer, self._compactor
+        if writer is not None:
+            writer.join()
+            self._writer = None
+        if compactor is not None:
+            compactor.join()
+        self._adopt_snapshot()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            if self.index is not None and self.index.seq != self.seq:
+                # Alle Instanzen schreiben dieselbe Datei (über dieselbe .tmp)
+                lock = _acquire(self._lock_path)
+                try:
+                    self.index.save(self.seq)
+                finally:
+                    _release(lock)
+
+    # ---------- CSV ----------
+    def import_csv(self, path: str) -> list:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        return self.add_many([(row.get("titel", ""), row.get("inhalt", ""), row.get("status") or "Neu")
+                              for row in rows])
+
+    def export_csv(self, path: str):
+        def write(f):
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDS)
+            for rec in self.records.values():
+                writer.writerow([rec.titel, self.body(rec), rec.status])
+        _replace_atomic(path, write)
@@ -0,0 +1,106 @@
+# --- Dateibeobachtung für notiz ---
+# Dieser Block meldet, ob sich Dateien des Speichers (Protokoll, Snapshot)
+# geändert haben, damit die Oberfläche nur dann sync() aufruft. Unter Linux
+# über inotify (per ctypes, ohne Zusatzpaket) auf dem Verzeichnis; sonst oder
+# wenn inotify nicht verfügbar ist, durch Vergleich von os.stat().
+# Name: notiz_watch
+import ctypes
+import ctypes.util
+import os
+import struct
+
+# inotify-Konstanten aus <sys/inotify.h>
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+# struct inotify_event: int wd; uint32 mask, cookie, len; char name[len]
+_EVENT = struct.Struct("iIII")
+
+
+# --- Hilfsfunktion: libc mit inotify laden ---
+# Zweck: None, wenn es kein inotify gibt (nicht Linux, libc ohne die Funktionen)
+# Name: _load_inotify
+def _load_inotify():
+    name = ctypes.util.find_library("c")
+    if name is None:
+        return None
+    try:
+        libc = ctypes.CDLL(name, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+# --- Beobachter ---
+# Zweck: changed() sagt, ob seit dem letzten Aufruf eine der Dateien angefasst wurde
+# Name: FileWatcher
+class FileWatcher:
+    """
+    Alle Dateien müssen im selben Verzeichnis liegen. Eigene Schreibzugriffe
+    werden mitgemeldet; sync() erkennt sie und kostet dann nur ein stat().
+    changed() blockiert nie und ist für den Aufruf aus einem Tk-Timer gedacht.
+    """
+    WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, *paths: str):
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.directory = os.path.dirname(self.paths[0])
+        self._names = {os.fsencode(os.path.basename(p)) for p in self.paths}
+        self._fd = None
+        self._stats = None
+        libc = _load_inotify()
+        if libc is not None:
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                if libc.inotify_add_watch(fd, os.fsencode(self.directory), self.WATCH_MASK) >= 0:
+                    self._fd = fd
+                else:
+                    os.close(fd)
+        if self._fd is None:
+            self._stats = self._stat_all()
+
+    def _stat_all(self) -> list:
+        # (inode, Größe, Änderungszeit) je Datei; None, wenn sie gerade fehlt
+        result = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                result.append(None)
+            else:
+                result.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        return result
+
+    def changed(self) -> bool:
+        if self._fd is None:
+            stats = self._stat_all()
+            changed, self._stats = stats != self._stats, stats
+            return changed
+        changed = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            pos = 0
+            while pos + _EVENT.size <= len(data):
+                _, mask, _, length = _EVENT.unpack_from(data, pos)
+                name = data[pos + _EVENT.size:pos + _EVENT.size + length].rstrip(b"\0")
+                pos += _EVENT.size + length
+                # Überlauf: Ereignisse verloren, also vorsichtshalber melden
+                if mask & IN_Q_OVERFLOW or name in self._names:
+                    changed = True
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,46 @@
+# --- Tests für einkauf_bulk ---
+# Dieser Block prüft das Lesen der CSV-Dateien: Trenner , ; und Tab, auch wenn
+# die Zellen selbst Komma-Listen enthalten, und die Meldung bei unklarem Trenner.
+# Name: test_einkauf_bulk
+import os
+
+import pytest
+
+import einkauf_bulk
+
+
+def parse(tmp_path, text: str):
+    path = tmp_path / "rezepte.csv"
+    path.write_bytes(text.encode("utf-8"))
+    recipes, keys, size, errors = einkauf_bulk.parse_job([(str(path), 0, os.path.getsize(path), None)])
+    return recipes, errors
+
+
+@pytest.mark.parametrize("delimiter", [",", ";", "\t"])
+def test_csv_one_ingredient_per_cell(tmp_path, delimiter):
+    text = delimiter.join(["Name", "Zutat", "Zutat"]) + "\n" + delimiter.join(["Kuchen", "Mehl", "Eier"]) + "\n"
+    recipes, errors = parse(tmp_path, text)
+    assert errors == []
+    assert recipes == [("Kuchen", ["Mehl", "Eier"])]
+
+
+@pytest.mark.parametrize("delimiter", [";", "\t"])
+def test_csv_cells_with_comma_lists(tmp_path, delimiter):
+    text = (delimiter.join(["Name", "Zutaten"]) + "\n"
+            + delimiter.join(["Rezept 0", "Mehl, Eier, Milch", "Salz"]) + "\n"
+            + delimiter.join(["Rezept 1", "Mehl, Eier"]) + "\n")
+    recipes, errors = parse(tmp_path, text)
+    assert errors == []
+    assert recipes == [("Rezept 0", ["Mehl", "Eier", "Milch", "Salz"]), ("Rezept 1", ["Mehl", "Eier"])]
+
+
+def test_csv_comma_with_quoted_list(tmp_path):
+    recipes, errors = parse(tmp_path, 'Rezept 0,"Mehl, Eier",Salz\n')
+    assert errors == []
+    assert recipes == [("Rezept 0", ["Mehl", "Eier", "Salz"])]
+
+
+def test_csv_ambiguous_delimiter_is_reported(tmp_path):
+    recipes, errors = parse(tmp_path, "Rezept 0;Mehl\tEier\n")
+    assert recipes == []
+    assert len(errors) == 1 and "Trenner" in errors[0][1]
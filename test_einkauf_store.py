@@ -0,0 +1,73 @@
+# --- Tests für einkauf_store ---
+# Dieser Block prüft die Migration alter Datenbanken (Schema-Version 1 ohne
+# kanonische Schlüssel) und das Zusammenführen gleicher Zutaten dabei.
+# Name: test_einkauf_store
+import sqlite3
+
+from einkauf_store import SCHEMA_VERSION, RecipeStore
+
+# Schema der Version 1: Zutaten nur nach exakter Schreibweise eindeutig
+SCHEMA_V1 = """
+CREATE TABLE recipe (
+    id   INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE ingredient (
+    id        INTEGER PRIMARY KEY,
+    name      TEXT NOT NULL UNIQUE,
+    available INTEGER NOT NULL DEFAULT 0,
+    listed    INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE recipe_ingredient (
+    recipe_id     INTEGER NOT NULL REFERENCES recipe(id) ON DELETE CASCADE,
+    position      INTEGER NOT NULL,
+    ingredient_id INTEGER NOT NULL REFERENCES ingredient(id),
+    PRIMARY KEY (recipe_id, position)
+) WITHOUT ROWID;
+CREATE INDEX recipe_ingredient_by_ingredient ON recipe_ingredient(ingredient_id);
+PRAGMA user_version=1;
+"""
+
+
+def make_v1(path: str):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_V1)
+    with conn:
+        conn.executemany("INSERT INTO ingredient(id, name, available, listed) VALUES (?, ?, ?, ?)",
+                         [(1, "Eier", 0, 1), (2, "Mehl", 1, 1), (3, "eier ", 1, 0), (4, "Zucker", 0, 0)])
+        conn.executemany("INSERT INTO recipe(id, name) VALUES (?, ?)", [(1, "Kuchen"), (2, "Omelett")])
+        conn.executemany("INSERT INTO recipe_ingredient(recipe_id, position, ingredient_id) VALUES (?, ?, ?)",
+                         [(1, 0, 3), (1, 1, 2), (1, 2, 1), (1, 3, 4), (2, 0, 3)])
+    conn.close()
+
+
+def test_migrate_v1_merges_spellings(tmp_path):
+    path = str(tmp_path / "einkauf.db")
+    make_v1(path)
+    store = RecipeStore(path)
+    try:
+        assert store.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        rows = store.conn.execute("SELECT id, name, key, available, listed FROM ingredient ORDER BY id").fetchall()
+        # Die erste Zeile je Schlüssel bleibt, Verfügbarkeit und Liste werden übernommen
+        assert rows == [(1, "Eier", "eier", 1, 1), (2, "Mehl", "mehl", 1, 1), (4, "Zucker", "zucker", 0, 0)]
+        recipes, ingredients = store.load()
+        # "eier " stand vorne, "Eier" später: nur die erste Stelle bleibt
+        assert recipes == {"Kuchen": ["Eier", "Mehl", "Zucker"], "Omelett": ["Eier"]}
+        assert ingredients == {"Eier": True, "Mehl": True}
+        assert store.conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    finally:
+        store.close()
+
+
+def test_migrated_database_accepts_new_spellings(tmp_path):
+    path = str(tmp_path / "einkauf.db")
+    make_v1(path)
+    RecipeStore(path).close()
+    store = RecipeStore(path)
+    try:
+        store.save_recipe("Pfannkuchen", ["EIER", "Milch"])
+        recipes, _ = store.load()
+        assert recipes["Pfannkuchen"] == ["Eier", "Milch"]
+        assert store.conn.execute("SELECT COUNT(*) FROM ingredient WHERE key = 'eier'").fetchone()[0] == 1
+    finally:
+        store.close()
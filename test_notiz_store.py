@@ -0,0 +1,128 @@
+# --- Tests für notiz_store ---
+# Dieser Block prüft die Fälle, in denen Protokoll und Snapshot nicht einfach
+# nacheinander geschrieben werden: abgerissenes Ende nach einem Absturz, zwei
+# Instanzen mit derselben neuen ID und sync() über eine fremde Verdichtung.
+# Name: test_notiz_store
+import os
+
+import pytest
+
+import notiz_store
+from notiz_store import NoteStore
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    # Mehrere Instanzen auf denselben Dateien; alle werden am Ende geschlossen
+    stores = []
+
+    def make():
+        store = NoteStore(str(tmp_path / "inhalte.journal"), str(tmp_path / "inhalte.snapshot"),
+                          fsync=False, interval=0.01)
+        store.open()
+        stores.append(store)
+        return store
+    yield make
+    for store in stores:
+        if store._writer is not None:
+            store.close()
+
+
+def state(store) -> dict:
+    return {rec.id: (rec.titel, rec.status, store.body(rec)) for rec in store.records.values()}
+
+
+def test_replay_truncates_torn_tail(make_store):
+    store = make_store()
+    store.add("Erster", "Text 1")
+    store.add("Zweiter", "Text 2")
+    store.close()
+    good = os.path.getsize(store.journal_path)
+    # Absturz mitten im Schreiben: Zeile vollständig, Text abgerissen
+    with open(store.journal_path, "ab") as f:
+        f.write(b'{"op":"add","id":3,"titel":"Halb","status":"Neu","seq":3,"len":50}\nnur ein Teil')
+
+    store = make_store()
+    assert state(store) == {1: ("Erster", "Neu", "Text 1"), 2: ("Zweiter", "Neu", "Text 2")}
+    assert os.path.getsize(store.journal_path) == good
+    store.add("Dritter", "Text 3")
+    store.close()
+
+    store = make_store()
+    assert [rec.titel for rec in store.records.values()] == ["Erster", "Zweiter", "Dritter"]
+    assert store.body(store.records[3]) == "Text 3"
+
+
+def test_same_new_id_in_two_instances_is_renumbered(make_store):
+    a = make_store()
+    b = make_store()
+    mine = a.add("von A", "a")
+    theirs = b.add("von B", "b")
+    assert mine.id == theirs.id == 1
+    assert a.flush() is None
+    # B findet beim Schreiben A's Eintrag vor, übernimmt ihn und weicht aus
+    assert b.flush() is None
+    assert theirs.id == 2
+    a.sync()
+    expected = {1: ("von A", "Neu", "a"), 2: ("von B", "Neu", "b")}
+    assert state(a) == state(b) == expected
+    a.close()
+    b.close()
+    assert state(make_store()) == expected
+
+
+def test_sync_follows_foreign_compaction(make_store):
+    a = make_store()
+    b = make_store()
+    first = a.add("vorher", "alt")
+    assert a.flush() is None
+    b.sync()
+    a.edit(first, "vorher", "geändert")
+    a.compact()
+    assert os.path.exists(a.snapshot_path)
+    assert not os.path.exists(a._rotated_path)
+    a.add("nachher", "neu")
+    assert a.flush() is None
+
+    # B liest das alte Protokoll zu Ende und macht im neuen weiter
+    b.sync()
+    assert state(b) == state(a)
+    b.add("von B", "b")
+    assert b.flush() is None
+    a.sync()
+    assert state(a) == state(b)
+    assert [rec.titel for rec in a.records.values()] == ["vorher", "nachher", "von B"]
+
+
+def test_sync_reloads_after_several_foreign_compactions(make_store):
+    a = make_store()
+    b = make_store()
+    a.add("eins", "1")
+    assert a.flush() is None
+    b.sync()
+    # Zwei Verdichtungen, ohne dass B dazwischen liest: das Protokoll, in dem B
+    # stand, ist dann schon gelöscht
+    a.compact()
+    a.add("zwei", "2")
+    a.compact()
+    a.add("drei", "3")
+    assert a.flush() is None
+    b.sync()
+    assert state(b) == state(a)
+    assert sorted(rec.titel for rec in b.records.values()) == ["drei", "eins", "zwei"]
+
+
+def test_automatic_compaction_runs_in_background(make_store, monkeypatch):
+    monkeypatch.setattr(notiz_store, "COMPACT_MIN_BYTES", 200)
+    store = make_store()
+    for i in range(20):
+        store.add(f"Titel {i}", "x" * 40)
+    assert store.flush() is None
+    store.move(store.records[1], "Alt")
+    store._compactor.join()
+    assert store.compact_error is None
+    assert os.path.exists(store.snapshot_path)
+    store.close()
+    store = make_store()
+    assert len(store.records) == 20
+    assert store.records[1].status == "Alt"
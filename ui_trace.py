@@ -0,0 +1,326 @@
+# --- Messung der Bedienlatenz für einkauf2 und notiz ---
+# Dieser Block misst auf Wunsch, wohin die Zeit im GUI-Thread geht: jede
+# Qt-Slot- bzw. Tk-Callback-Ausführung als Zeitspanne, Hänger der Ereignis-
+# schleife (ein Wachhund-Thread sieht, wenn der Herzschlag-Timer ausbleibt, und
+# tastet dann den Stack des GUI-Threads ab) und wie viele Widgets pro Aufruf
+# entstehen. Am Ende stehen eine Chrome-Trace-Datei (chrome://tracing, Perfetto)
+# und daneben eine Textzusammenfassung mit Histogramm.
+#     UI_TRACE=1 python einkauf2.py              -> ui_trace.json, ui_trace.txt
+#     UI_TRACE=messung.json python notiz.py      -> messung.json, messung.txt
+#     UI_TRACE_STALL_MS=50                       Hänger-Schwelle (Standard 100)
+# Ohne UI_TRACE tut der Block nichts: slot() gibt die Funktion unverändert zurück.
+# Name: ui_trace
+import atexit
+import inspect
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+
+TRACE_ENV = "UI_TRACE"
+STALL_ENV = "UI_TRACE_STALL_MS"
+DEFAULT_FILE = "ui_trace.json"
+
+STALL_MS = 100       # ab so langem Ausbleiben des Herzschlags gilt die Schleife als hängend
+HEARTBEAT_MS = 20    # Takt des Herzschlag-Timers in der Ereignisschleife
+SAMPLE_MS = 10       # Abstand der Stack-Proben während eines Hängers
+STACK_DEPTH = 12     # innerste Aufrufe pro Probe
+MAX_EVENTS = 500000  # danach nur noch Statistik, keine weiteren Trace-Ereignisse
+# Klassengrenzen des Histogramms in Millisekunden (letzte Klasse: darüber)
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+_tracer = None
+
+
+# --- Hilfsfunktion: Anzahl übergebbarer Argumente ---
+# Zweck: Qt übergibt Signalargumente, die ein Slot nicht annimmt, einfach nicht;
+#        der Wrapper muss das nachbilden (None: nimmt beliebig viele)
+# Name: _arity
+def _arity(fn):
+    try:
+        sig = inspect.signature(fn)
+    except (TypeError, ValueError):
+        return None
+    count = 0
+    for p in sig.parameters.values():
+        if p.kind == p.VAR_POSITIONAL:
+            return None
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD):
+            count += 1
+    return count
+
+
+def _name(fn) -> str:
+    return getattr(fn, "__qualname__", None) or getattr(fn, "__name__", None) or repr(fn)
+
+
+def _tk_target(fn):
+    # Misc.after() registriert nicht die Funktion selbst, sondern eine Hülle
+    # "callit", die sie in ihrer Closure hält
+    code = getattr(fn, "__code__", None)
+    if code is not None and fn.__closure__ and fn.__qualname__.endswith("after.<locals>.callit"):
+        cells = dict(zip(code.co_freevars, fn.__closure__))
+        if "func" in cells:
+            return cells["func"].cell_contents
+    return fn
+
+
+# --- Messung ---
+# Zweck: sammelt Zeitspannen, Hänger und Widget-Zählungen, schreibt sie am Ende
+# Name: Tracer
+class Tracer:
+    """
+    Zeitspannen werden nur im GUI-Thread (dem, der den Tracer anlegt) erfasst.
+    Widgets, die während einer Spanne entstehen, zählen für sie und alle
+    umschließenden Spannen; die Zählung steht in den args des Ereignisses.
+    """
+    def __init__(self, path: str, stall_ms: float = STALL_MS):
+        self.path = path
+        self.stall = stall_ms / 1000
+        self._origin = time.perf_counter()
+        self._main = threading.get_ident()
+        self._lock = threading.Lock()
+        self._events = []
+        self._durations = {}      # {name: [ms, ...]}
+        self._widgets_max = Counter()  # {name: meiste Widgets in einem Aufruf}
+        self._widgets = Counter()      # {Klasse: Anzahl} über die ganze Laufzeit
+        self._open = []           # offene Spannen: je ein Counter der erzeugten Widgets
+        self._stalls = []         # Dauer in ms
+        self._last_beat = time.perf_counter()
+        self._stop = threading.Event()
+        self._watchdog = None
+        self._closed = False
+
+    def _us(self, t: float) -> int:
+        return int((t - self._origin) * 1e6)
+
+    def _event(self, event: dict):
+        with self._lock:
+            if len(self._events) < MAX_EVENTS:
+                self._events.append(event)
+
+    # ---------- Zeitspannen ----------
+    def call(self, name: str, category: str, fn, *args):
+        if threading.get_ident() != self._main:
+            return fn(*args)
+        created = Counter()
+        self._open.append(created)
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            t1 = time.perf_counter()
+            self._open.pop()
+            if self._open:
+                self._open[-1].update(created)
+            ms = (t1 - t0) * 1000
+            self._durations.setdefault(name, []).append(ms)
+            event = {"name": name, "cat": category, "ph": "X", "ts": self._us(t0),
+                     "dur": self._us(t1) - self._us(t0), "pid": os.getpid(), "tid": self._main}
+            if created:
+                total = sum(created.values())
+                self._widgets_max[name] = max(self._widgets_max[name], total)
+                event["args"] = {"widgets": total, "classes": dict(created)}
+            self._event(event)
+
+    def wrap(self, fn, name: str = None, category: str = "slot"):
+        name = name or _name(fn)
+        arity = _arity(fn)
+
+        def traced(*args):
+            if arity is not None:
+                args = args[:arity]
+            return self.call(name, category, fn, *args)
+        traced.__qualname__ = name
+        return traced
+
+    def count_widget(self, kind: str):
+        self._widgets[kind] += 1
+        if self._open and threading.get_ident() == self._main:
+            self._open[-1][kind] += 1
+
+    # ---------- Hänger ----------
+    def beat(self):
+        # Aus der Ereignisschleife per Timer aufgerufen: sie läuft
+        self._last_beat = time.perf_counter()
+
+    def start_watchdog(self):
+        self._last_beat = time.perf_counter()
+        self._watchdog = threading.Thread(target=self._watch, name="ui_trace-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def _sample(self) -> tuple:
+        frame = sys._current_frames().get(self._main)
+        if frame is None:
+            return ()
+        stack = traceback.extract_stack(frame)[-STACK_DEPTH:]
+        return tuple(f"{f.name} ({os.path.basename(f.filename)}:{f.lineno})" for f in stack)
+
+    def _watch(self):
+        start = None       # Beginn des laufenden Hängers (letzter Herzschlag davor)
+        samples = Counter()
+        limit = self.stall + HEARTBEAT_MS / 1000
+        while not self._stop.wait(SAMPLE_MS / 1000):
+            beat = self._last_beat
+            if time.perf_counter() - beat > limit:
+                if start is None:
+                    start = beat
+                samples[self._sample()] += 1
+            elif start is not None:
+                self._record_stall(start, beat, samples)
+                start = None
+                samples = Counter()
+
+    def _record_stall(self, start: float, end: float, samples: Counter):
+        ms = (end - start) * 1000
+        self._stalls.append(ms)
+        total = sum(samples.values())
+        stacks = [{"share": round(n / total, 3), "stack": list(reversed(stack))}
+                  for stack, n in samples.most_common(3)]
+        self._event({"name": "Hänger", "cat": "stall", "ph": "X", "ts": self._us(start),
+                     "dur": self._us(end) - self._us(start), "pid": os.getpid(),
+                     "tid": self._main, "args": {"samples": total, "stacks": stacks}})
+
+    # ---------- Ausgabe ----------
+    def summary(self) -> str:
+        lines = [f"UI-Trace: {sum(map(len, self._durations.values()))} Aufrufe, "
+                 f"{len(self._stalls)} Hänger über {int(self.stall * 1000)} ms, "
+                 f"{sum(self._widgets.values())} Widgets erzeugt", ""]
+        rows = sorted(self._durations.items(), key=lambda item: -sum(item[1]))
+        width = max([len(name) for name, _ in rows] + [10])
+        lines.append(f"{'Aufruf':<{width}}  {'n':>6}  {'gesamt ms':>10}  {'median':>8}  "
+                     f"{'p95':>8}  {'max':>8}  {'Widgets max':>11}")
+        for name, samples in rows:
+            ordered = sorted(samples)
+            p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+            lines.append(f"{name:<{width}}  {len(ordered):>6}  {sum(ordered):>10.1f}  "
+                         f"{statistics.median(ordered):>8.2f}  {p95:>8.2f}  {ordered[-1]:>8.2f}  "
+                         f"{self._widgets_max[name]:>11}")
+        for title, samples in (("Verteilung aller Aufrufe (ms)", [ms for s in self._durations.values() for ms in s]),
+                               ("Verteilung der Hänger (ms)", self._stalls)):
+            lines += ["", title]
+            counts = [0] * (len(BUCKETS_MS) + 1)
+            for ms in samples:
+                counts[next((i for i, bound in enumerate(BUCKETS_MS) if ms < bound), len(BUCKETS_MS))] += 1
+            top = max(counts) or 1
+            labels = [f"< {b}" for b in BUCKETS_MS] + [f">= {BUCKETS_MS[-1]}"]
+            for label, n in zip(labels, counts):
+                lines.append(f"  {label:>7}  {'#' * round(40 * n / top):<40}  {n}")
+        if self._widgets:
+            lines += ["", "Erzeugte Widgets"]
+            lines += [f"  {kind:<30}  {n}" for kind, n in self._widgets.most_common()]
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+        with self._lock:
+            events = list(self._events)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        with open(os.path.splitext(self.path)[0] + ".txt", "w", encoding="utf-8") as f:
+            f.write(self.summary())
+        print(f"UI-Trace geschrieben: {self.path}", file=sys.stderr)
+
+
+# --- Einschalten ---
+# Zweck: Tracer aus der Umgebung anlegen (einmal pro Prozess); None, wenn aus
+# Name: enable
+def enable():
+    global _tracer
+    if _tracer is None:
+        value = os.environ.get(TRACE_ENV, "")
+        if value in ("", "0"):
+            return None
+        path = DEFAULT_FILE if value == "1" else value
+        _tracer = Tracer(path, float(os.environ.get(STALL_ENV, STALL_MS)))
+        _tracer.start_watchdog()
+        atexit.register(_tracer.close)
+    return _tracer
+
+
+def slot(fn, name: str = None):
+    """
+    Für connect(): ohne Messung die Funktion selbst, sonst ein messender Wrapper.
+    Erst nach install_qt()/install_tk() wirksam.
+    """
+    if _tracer is None:
+        return fn
+    return _tracer.wrap(fn, name)
+
+
+# --- Anbindung Qt ---
+# Zweck: Herzschlag-Timer und Widget-Zählung über einen Ereignisfilter der Anwendung
+# Name: install_qt
+def install_qt(app):
+    """
+    Vor dem Aufbau des Hauptfensters aufrufen. Der Filter sieht jedes Ereignis;
+    das kostet etwas, fällt aber nur bei eingeschalteter Messung an.
+    """
+    tracer = enable()
+    if tracer is None:
+        return None
+    from PySide6 import QtCore
+
+    class WidgetCounter(QtCore.QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QtCore.QEvent.ChildAdded:
+                child = event.child()
+                if child is not None and child.isWidgetType():
+                    tracer.count_widget(child.metaObject().className())
+            return False
+
+    app._ui_trace_filter = WidgetCounter(app)
+    app.installEventFilter(app._ui_trace_filter)
+    timer = QtCore.QTimer(app)
+    timer.setInterval(HEARTBEAT_MS)
+    timer.timeout.connect(tracer.beat)
+    timer.start()
+    app._ui_trace_timer = timer
+    return tracer
+
+
+# --- Anbindung Tk ---
+# Zweck: jeder Tk-Callback (command, bind, after, trace_add) läuft über
+#        tkinter.CallWrapper; der wird durch eine messende Unterklasse ersetzt
+# Name: install_tk
+def install_tk(root):
+    """
+    Vor dem Aufbau der Oberfläche aufrufen: nur danach registrierte Callbacks
+    und erzeugte Widgets werden erfasst.
+    """
+    tracer = enable()
+    if tracer is None:
+        return None
+    import tkinter
+
+    class TracedCallWrapper(tkinter.CallWrapper):
+        def __call__(self, *args):
+            target = _tk_target(self.func)
+            if getattr(target, "_ui_trace_skip", False):
+                return super().__call__(*args)
+            return tracer.call(_name(target), "tk", super().__call__, *args)
+
+    tkinter.CallWrapper = TracedCallWrapper
+    base_init = tkinter.BaseWidget.__init__
+
+    def init(self, *args, **kw):
+        base_init(self, *args, **kw)
+        cls = type(self)
+        tracer.count_widget(f"{cls.__module__.rsplit('.', 1)[-1]}.{cls.__name__}")
+    tkinter.BaseWidget.__init__ = init
+
+    def heartbeat():
+        tracer.beat()
+        root.after(HEARTBEAT_MS, heartbeat)
+    heartbeat._ui_trace_skip = True
+    heartbeat()
+    return tracer